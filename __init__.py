@@ -291,8 +291,11 @@ def register():
     tools.supporter.load_supporters()
     tools.supporter.register_dynamic_buttons()
 
-    # Load the dictionaries and check if they are found.
-    globs.dict_found = tools.translate.load_translations()
+    # Keep the mesh index up to date
+    tools.common.register_handlers()
+
+    # Check if the dictionary is found. It only gets loaded once something is translated
+    globs.dict_found = os.path.isfile(tools.translate.dictionary_file)
 
     # Set preferred Blender options
     if hasattr(tools.common.get_user_preferences(), 'system') and hasattr(tools.common.get_user_preferences().system, 'use_international_fonts'):
@@ -354,6 +357,9 @@ def unregister():
             pass
     print('Unregistered', count, 'CATS classes.')
 
+    # Remove the handlers of the mesh index
+    tools.common.unregister_handlers()
+
     # Unregister all dynamic buttons and icons
     tools.supporter.unregister_dynamic_buttons()
     tools.supporter.unload_icons()
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import struct
 import os
+import sys
+import mmap
 import re
 import logging
 import collections
@@ -40,53 +42,107 @@ class FileStream:
             self.__file_obj = None
 
 
+class MappedFile:
+    """ A read-only memory map of a file. Empty files can't be mapped and use an empty buffer instead. """
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.data = b''
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                # a memoryview of the map is still in use, it gets unmapped together with the last view
+                pass
+        self.file.close()
+
+_INT = struct.Struct('<i')
+_UNSIGNED_INT = struct.Struct('<I')
+_SHORT = struct.Struct('<h')
+_UNSIGNED_SHORT = struct.Struct('<H')
+_FLOAT = struct.Struct('<f')
+_BYTE = struct.Struct('<B')
+_SIGNED_BYTE = struct.Struct('<b')
+_VECTORS = {size: struct.Struct('<'+'f'*size) for size in range(1, 5)}
+
+
 class  FileReadStream(FileStream):
+    """ Reads from a memory map of the file, values are unpacked directly from the map at the current offset. """
     def __init__(self, path, pmx_header=None):
-        self.__fin = open(path, 'rb')
-        FileStream.__init__(self, path, self.__fin)
+        self.__file = MappedFile(path)
+        self.__data = self.__file.data
+        self.__pos = 0
+        FileStream.__init__(self, path, self.__file)
+
+    def __unpack(self, fmt):
+        v, = fmt.unpack_from(self.__data, self.__pos)
+        self.__pos += fmt.size
+        return v
 
 
     # READ / WRITE methods for general types
     def readInt(self):
-        v, = struct.unpack('<i', self.__fin.read(4))
-        return v
+        return self.__unpack(_INT)
 
     def readUnsignedInt(self):
-        v, = struct.unpack('<I', self.__fin.read(4))
-        return v
+        return self.__unpack(_UNSIGNED_INT)
 
     def readShort(self):
-        v, = struct.unpack('<h', self.__fin.read(2))
-        return v
+        return self.__unpack(_SHORT)
 
     def readUnsignedShort(self):
-        v, = struct.unpack('<H', self.__fin.read(2))
-        return v
+        return self.__unpack(_UNSIGNED_SHORT)
 
     def readStr(self, size):
-        buf = self.__fin.read(size)
+        buf = self.readBytes(size)
         if buf[0] == b'\xfd':
             return ''
         return buf.split(b'\x00')[0].decode('shift_jis', errors='replace')
 
     def readFloat(self):
-        v, = struct.unpack('<f', self.__fin.read(4))
-        return v
+        return self.__unpack(_FLOAT)
 
     def readVector(self, size):
-        return struct.unpack('<'+'f'*size, self.__fin.read(4*size))
+        fmt = _VECTORS.get(size) or struct.Struct('<'+'f'*size)
+        v = fmt.unpack_from(self.__data, self.__pos)
+        self.__pos += fmt.size
+        return v
 
     def readByte(self):
-        v, = struct.unpack('<B', self.__fin.read(1))
-        return v
+        return self.__unpack(_BYTE)
 
     def readBytes(self, length):
-        return self.__fin.read(length)
+        v = self.__data[self.__pos:self.__pos+length]
+        self.__pos += len(v)
+        return v
 
     def readSignedByte(self):
-        v, = struct.unpack('<b', self.__fin.read(1))
+        return self.__unpack(_SIGNED_BYTE)
+
+    # READ methods for bulk data
+    def readBuffer(self, length):
+        """ Return a memoryview of the next length bytes of the map, without copying them. """
+        if length < 0 or self.__pos + length > len(self.__data):
+            raise struct.error('unpack requires a buffer of %d bytes'%length)
+        v = memoryview(self.__data)[self.__pos:self.__pos+length]
+        self.__pos += length
         return v
 
+    def readRecords(self, fmt, count):
+        """ Return an iterator over count records of the struct.Struct fmt, unpacked from a view of the map. """
+        return fmt.iter_unpack(self.readBuffer(fmt.size*count))
+
+    def readUnsignedShortArray(self, count):
+        """ Return the next count unsigned shorts as a view of the map. """
+        buf = self.readBuffer(2*count)
+        if sys.byteorder == 'little':
+            return buf.cast('H')
+        return struct.unpack('<%dH'%count, buf)
+
 
 class Header:
     PMD_SIGN = b'Pmd'
@@ -110,6 +166,9 @@ class Header:
         self.comment = fs.readStr(256)
 
 class Vertex:
+    # position, normal, uv, bones, weight and edge flag
+    RECORD = struct.Struct('<8f2H2B')
+
     def __init__(self):
         self.position = [0.0, 0.0, 0.0]
         self.normal = [1.0, 0.0, 0.0]
@@ -127,6 +186,14 @@ class Vertex:
         self.weight = fs.readByte()
         self.enable_edge = fs.readByte()
 
+    def set(self, values):
+        # values of one RECORD
+        self.position = values[0:3]
+        self.normal = values[3:6]
+        self.uv = values[6:8]
+        self.bones[0], self.bones[1] = values[8:10]
+        self.weight, self.enable_edge = values[10:12]
+
 class Material:
     def __init__(self):
         self.diffuse = []
@@ -356,9 +423,9 @@ class Model:
         logging.info('------------------------------')
         self.vertices = []
         vert_count = fs.readUnsignedInt()
-        for i in range(vert_count):
+        for values in fs.readRecords(Vertex.RECORD, vert_count):
             v = Vertex()
-            v.load(fs)
+            v.set(values)
             self.vertices.append(v)
         logging.info('the number of vetices: %d', len(self.vertices))
         logging.info('finished importing vertices.')
@@ -369,10 +436,8 @@ class Model:
         logging.info('------------------------------')
         self.faces = []
         face_vert_count = fs.readUnsignedInt()
-        for i in range(int(face_vert_count/3)):
-            f1 = fs.readUnsignedShort()
-            f2 = fs.readUnsignedShort()
-            f3 = fs.readUnsignedShort()
+        indices = iter(fs.readUnsignedShortArray(int(face_vert_count/3)*3))
+        for f1, f2, f3 in zip(indices, indices, indices):
             self.faces.append((f3, f2, f1))
         logging.info('the number of faces: %d', len(self.faces))
         logging.info('finished importing faces.')
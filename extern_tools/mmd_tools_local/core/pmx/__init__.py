@@ -1,7 +1,14 @@
 # -*- coding: utf-8 -*-
 import struct
 import os
+import mmap
 import logging
+from collections.abc import MutableSequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class InvalidFileError(Exception):
     pass
@@ -37,24 +44,60 @@ class FileStream:
             self.__file_obj.close()
             self.__file_obj = None
 
+class MappedFile:
+    """ A read-only memory map of a file. Empty files can't be mapped and use an empty buffer instead. """
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.data = b''
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                # a memoryview of the map is still in use, it gets unmapped together with the last view
+                pass
+        self.file.close()
+
+_INT = struct.Struct('<i')
+_UNSIGNED_INT = struct.Struct('<I')
+_SHORT = struct.Struct('<h')
+_UNSIGNED_SHORT = struct.Struct('<H')
+_FLOAT = struct.Struct('<f')
+_BYTE = struct.Struct('<B')
+_SIGNED_BYTE = struct.Struct('<b')
+_VECTORS = {size: struct.Struct('<'+'f'*size) for size in range(1, 5)}
+_SIGNED_INDEX_TYPES = { 1 :_SIGNED_BYTE, 2 :_SHORT, 4 :_INT}
+_UNSIGNED_INDEX_TYPES = { 1 :_BYTE, 2 :_UNSIGNED_SHORT, 4 :_UNSIGNED_INT}
+_UNSIGNED_ARRAY_TYPES = { 1 :'<u1', 2 :'<u2', 4 :'<u4'}
+_SIGNED_ARRAY_TYPES = { 1 :'<i1', 2 :'<i2', 4 :'<i4'}
+
 class FileReadStream(FileStream):
+    """ Reads from a memory map of the file, values are unpacked directly from the map at the current offset. """
     def __init__(self, path, pmx_header=None):
-        self.__fin = open(path, 'rb')
-        FileStream.__init__(self, path, self.__fin, pmx_header)
+        self.__file = MappedFile(path)
+        self.__data = self.__file.data
+        self.__pos = 0
+        FileStream.__init__(self, path, self.__file, pmx_header)
+
+    def __unpack(self, fmt):
+        v, = fmt.unpack_from(self.__data, self.__pos)
+        self.__pos += fmt.size
+        return v
 
     def __readIndex(self, size, typedict):
-        index = None
-        if size in typedict :
-            index, = struct.unpack(typedict[size], self.__fin.read(size))
-        else:
+        if size not in typedict:
             raise ValueError('invalid data size %s'%str(size))
-        return index
+        return self.__unpack(typedict[size])
 
     def __readSignedIndex(self, size):
-        return self.__readIndex(size, { 1 :"<b", 2 :"<h", 4 :"<i"})
+        return self.__readIndex(size, _SIGNED_INDEX_TYPES)
 
     def __readUnsignedIndex(self, size):
-        return self.__readIndex(size, { 1 :"<B", 2 :"<H", 4 :"<I"})
+        return self.__readIndex(size, _UNSIGNED_INDEX_TYPES)
 
 
     # READ methods for indexes
@@ -78,40 +121,62 @@ class FileReadStream(FileStream):
 
     # READ / WRITE methods for general types
     def readInt(self):
-        v, = struct.unpack('<i', self.__fin.read(4))
-        return v
+        return self.__unpack(_INT)
 
     def readShort(self):
-        v, = struct.unpack('<h', self.__fin.read(2))
-        return v
+        return self.__unpack(_SHORT)
 
     def readUnsignedShort(self):
-        v, = struct.unpack('<H', self.__fin.read(2))
-        return v
+        return self.__unpack(_UNSIGNED_SHORT)
 
     def readStr(self):
         length = self.readInt()
-        buf, = struct.unpack('<%ds'%length, self.__fin.read(length))
-        return str(buf, self.header().encoding.charset, errors='replace')
+        # decoded straight from the map, without copying the bytes first
+        return str(self.readBuffer(length), self.header().encoding.charset, errors='replace')
 
     def readFloat(self):
-        v, = struct.unpack('<f', self.__fin.read(4))
-        return v
+        return self.__unpack(_FLOAT)
 
     def readVector(self, size):
-        return struct.unpack('<'+'f'*size, self.__fin.read(4*size))
+        fmt = _VECTORS.get(size) or struct.Struct('<'+'f'*size)
+        v = fmt.unpack_from(self.__data, self.__pos)
+        self.__pos += fmt.size
+        return v
 
     def readByte(self):
-        v, = struct.unpack('<B', self.__fin.read(1))
-        return v
+        return self.__unpack(_BYTE)
 
     def readBytes(self, length):
-        return self.__fin.read(length)
+        v = self.__data[self.__pos:self.__pos+length]
+        self.__pos += len(v)
+        return v
 
     def readSignedByte(self):
-        v, = struct.unpack('<b', self.__fin.read(1))
+        return self.__unpack(_SIGNED_BYTE)
+
+    # READ methods for bulk data
+    def readBuffer(self, length):
+        """ Return a memoryview of the next length bytes of the map, without copying them. """
+        if length < 0 or self.__pos + length > len(self.__data):
+            raise struct.error('unpack requires a buffer of %d bytes'%length)
+        v = memoryview(self.__data)[self.__pos:self.__pos+length]
+        self.__pos += length
         return v
 
+    def readVertexIndexArray(self, count):
+        """ Return the next count vertex indices as a numpy array, which is a view of the map. """
+        size = self.header().vertex_index_size
+        if size not in _UNSIGNED_ARRAY_TYPES:
+            raise ValueError('invalid data size %s'%str(size))
+        return np.frombuffer(self.readBuffer(size*count), dtype=_UNSIGNED_ARRAY_TYPES[size])
+
+    def peekRemaining(self):
+        """ Return a memoryview of the rest of the file without moving the read position. Use skip() to move past the used data. """
+        return memoryview(self.__data)[self.__pos:]
+
+    def skip(self, length):
+        self.__pos += length
+
 class FileWriteStream(FileStream):
     def __init__(self, path, pmx_header=None):
         self.__fout = open(path, 'wb')
@@ -367,11 +432,14 @@ class Model:
         logging.info('Load Vertices')
         logging.info('------------------------------')
         num_vertices = fs.readInt()
-        self.vertices = []
-        for i in range(num_vertices):
-            v = Vertex()
-            v.load(fs)
-            self.vertices.append(v)
+        if np is not None:
+            self.vertices = RecordList(VertexArrays.load(fs, num_vertices))
+        else:
+            self.vertices = []
+            for i in range(num_vertices):
+                v = Vertex()
+                v.load(fs)
+                self.vertices.append(v)
         logging.info('----- Loaded %d vertices', len(self.vertices))
 
         logging.info('')
@@ -379,12 +447,16 @@ class Model:
         logging.info(' Load Faces')
         logging.info('------------------------------')
         num_faces = fs.readInt()
-        self.faces = []
-        for i in range(int(num_faces/3)):
-            f1 = fs.readVertexIndex()
-            f2 = fs.readVertexIndex()
-            f3 = fs.readVertexIndex()
-            self.faces.append((f3, f2, f1))
+        if np is not None:
+            indices = fs.readVertexIndexArray(int(num_faces/3)*3).reshape(-1, 3)
+            self.faces = list(map(tuple, indices[:, ::-1].tolist()))
+        else:
+            self.faces = []
+            for i in range(int(num_faces/3)):
+                f1 = fs.readVertexIndex()
+                f2 = fs.readVertexIndex()
+                f3 = fs.readVertexIndex()
+                self.faces.append((f3, f2, f1))
         logging.info(' Load %d faces', len(self.faces))
 
         logging.info('')
@@ -644,6 +716,8 @@ comment(english):
             )
 
 class Vertex:
+    __slots__ = ('co', 'normal', 'uv', 'additional_uvs', 'weight', 'edge_scale')
+
     def __init__(self):
         self.co = [0.0, 0.0, 0.0]
         self.normal = [0.0, 0.0, 0.0]
@@ -685,6 +759,8 @@ class Vertex:
         fs.writeFloat(self.edge_scale)
 
 class BoneWeightSDEF:
+    __slots__ = ('weight', 'c', 'r0', 'r1')
+
     def __init__(self, weight=0, c=None, r0=None, r1=None):
         self.weight = weight
         self.c = c
@@ -704,6 +780,8 @@ class BoneWeight:
         (SDEF, 'SDEF'),
         ]
 
+    __slots__ = ('bones', 'weights', 'type')
+
     def __init__(self):
         self.bones = []
         self.weights = []
@@ -777,6 +855,317 @@ class BoneWeight:
             raise ValueError('invalid weight type %s'%str(self.type))
 
 
+class RecordArrays:
+    """ Base class for records which are stored as numpy columns, one row per record.
+
+    The columns are the attributes named in COLUMNS. view() returns an object for one row,
+    setRecord() writes a record object into a row.
+    """
+    COLUMNS = ()
+
+    def __len__(self):
+        return len(getattr(self, self.COLUMNS[0]))
+
+    def view(self, index):
+        raise NotImplementedError
+
+    def setRecord(self, index, record):
+        raise NotImplementedError
+
+    def copyRow(self, dst, src):
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[dst] = column[src]
+
+    def delete(self, index):
+        for name in self.COLUMNS:
+            setattr(self, name, np.delete(getattr(self, name), index, axis=0))
+
+    def insert(self, index):
+        for name in self.COLUMNS:
+            setattr(self, name, np.insert(getattr(self, name), index, 0, axis=0))
+
+class RecordList(MutableSequence):
+    """ A list of the records of a RecordArrays.
+
+    The items are views which are created on access and read and write the columns directly.
+    Deleting or inserting items moves the rows, so views taken before that may point to another record.
+    """
+    def __init__(self, arrays):
+        self.arrays = arrays
+
+    def __len__(self):
+        return len(self.arrays)
+
+    def __checkIndex(self, index):
+        length = len(self.arrays)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('list index out of range')
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.arrays.view(i) for i in range(*index.indices(len(self)))]
+        return self.arrays.view(self.__checkIndex(index))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            raise TypeError('slice assignment is not supported')
+        self.arrays.setRecord(self.__checkIndex(index), value)
+
+    def __delitem__(self, index):
+        if not isinstance(index, slice):
+            index = self.__checkIndex(index)
+        self.arrays.delete(index)
+
+    def insert(self, index, value):
+        length = len(self.arrays)
+        index = min(max(index + length if index < 0 else index, 0), length)
+        if getattr(value, '_arrays', None) is self.arrays and value._index >= index:
+            # the row of the view moves down by the insert
+            value = self.arrays.view(value._index + 1)
+        self.arrays.insert(index)
+        self.arrays.setRecord(index, value)
+
+    def __repr__(self):
+        return '<%s %d items>'%(self.__class__.__name__, len(self))
+
+class VertexArrays(RecordArrays):
+    """ The vertex data of a model as columns, decoded in bulk with numpy.
+
+    bones and weights are the raw values of the weight block, unused entries are -1 and 0.
+    BDEF1 has no weights, BDEF2 and SDEF store the weight of the first bone only.
+    The SDEF vectors are zero for all other weight types.
+    """
+    COLUMNS = ('co', 'normal', 'uv', 'additional_uvs', 'weight_type', 'bones', 'weights', 'sdef_c', 'sdef_r0', 'sdef_r1', 'edge_scale')
+
+    def __init__(self, count, additional_uvs=0):
+        self.co = np.zeros((count, 3), dtype=np.float32)
+        self.normal = np.zeros((count, 3), dtype=np.float32)
+        self.uv = np.zeros((count, 2), dtype=np.float32)
+        self.additional_uvs = np.zeros((count, additional_uvs, 4), dtype=np.float32)
+        self.weight_type = np.zeros(count, dtype=np.uint8)
+        self.bones = np.full((count, 4), -1, dtype=np.int32)
+        self.weights = np.zeros((count, 4), dtype=np.float32)
+        self.sdef_c = np.zeros((count, 3), dtype=np.float32)
+        self.sdef_r0 = np.zeros((count, 3), dtype=np.float32)
+        self.sdef_r1 = np.zeros((count, 3), dtype=np.float32)
+        self.edge_scale = np.ones(count, dtype=np.float32)
+
+    @classmethod
+    def load(cls, fs, count):
+        header = fs.header()
+        bone_size = header.bone_index_size
+        if bone_size not in _SIGNED_ARRAY_TYPES:
+            raise ValueError('invalid data size %s'%str(bone_size))
+        vertex_arrays = cls(count, header.additional_uvs)
+        if count == 0:
+            return vertex_arrays
+
+        data = fs.peekRemaining()
+        prefix_size = 4*(8 + 4*header.additional_uvs)
+        layouts = _weightLayouts(bone_size)
+        offsets, weight_types, end = _scanVertexOffsets(data, count, prefix_size, layouts)
+        raw = np.frombuffer(data, dtype=np.uint8, count=end)
+
+        def gather(starts, size, dtype):
+            chunk = raw[starts[:, None] + np.arange(size)]
+            return chunk.view(dtype).reshape(len(starts), -1)
+
+        floats = gather(offsets, prefix_size, '<f4')
+        vertex_arrays.co[:] = floats[:, 0:3]
+        vertex_arrays.normal[:] = floats[:, 3:6]
+        vertex_arrays.uv[:] = floats[:, 6:8]
+        vertex_arrays.additional_uvs[:] = floats[:, 8:].reshape(count, header.additional_uvs, 4)
+        vertex_arrays.weight_type[:] = weight_types
+
+        sizes = np.zeros(count, dtype=np.int64)
+        for weight_type, (num_bones, num_floats, size) in enumerate(layouts):
+            selected = np.flatnonzero(weight_types == weight_type)
+            if len(selected) == 0:
+                continue
+            sizes[selected] = prefix_size + size
+            starts = offsets[selected] + prefix_size + 1
+            vertex_arrays.bones[selected, :num_bones] = gather(starts, bone_size*num_bones, _SIGNED_ARRAY_TYPES[bone_size])
+            if num_floats == 0:
+                continue
+            floats = gather(starts + bone_size*num_bones, 4*num_floats, '<f4')
+            if weight_type == BoneWeight.SDEF:
+                vertex_arrays.weights[selected, 0] = floats[:, 0]
+                vertex_arrays.sdef_c[selected] = floats[:, 1:4]
+                vertex_arrays.sdef_r0[selected] = floats[:, 4:7]
+                vertex_arrays.sdef_r1[selected] = floats[:, 7:10]
+            else:
+                vertex_arrays.weights[selected, :num_floats] = floats
+
+        vertex_arrays.edge_scale[:] = gather(offsets + sizes - 4, 4, '<f4')[:, 0]
+        fs.skip(end)
+        return vertex_arrays
+
+    def view(self, index):
+        return VertexView(self, index)
+
+    def setRecord(self, index, vertex):
+        if getattr(vertex, '_arrays', None) is self:
+            self.copyRow(index, vertex._index)
+            return
+        self.co[index] = vertex.co
+        self.normal[index] = vertex.normal
+        self.uv[index] = vertex.uv
+        self.additional_uvs[index] = 0
+        for i, uv in enumerate(vertex.additional_uvs[:self.additional_uvs.shape[1]]):
+            self.additional_uvs[index, i] = uv
+        self.setWeight(index, vertex.weight)
+        self.edge_scale[index] = vertex.edge_scale
+
+    def setWeight(self, index, weight):
+        self.weight_type[index] = weight.type
+        self.bones[index] = -1
+        self.bones[index, :len(weight.bones)] = weight.bones
+        self.weights[index] = 0
+        if isinstance(weight.weights, BoneWeightSDEF):
+            self.weights[index, 0] = weight.weights.weight
+            self.sdef_c[index] = weight.weights.c
+            self.sdef_r0[index] = weight.weights.r0
+            self.sdef_r1[index] = weight.weights.r1
+        elif len(weight.weights):
+            self.weights[index, :len(weight.weights)] = weight.weights
+
+def _weightLayouts(bone_size):
+    # (bone count, float count, full size after the fixed part of the vertex) for each weight type
+    layouts = []
+    for num_bones, num_floats in ((1, 0), (2, 1), (4, 4), (2, 10)):
+        layouts.append((num_bones, num_floats, 1 + bone_size*num_bones + 4*num_floats + 4))
+    return layouts
+
+def _scanVertexOffsets(data, count, prefix_size, layouts):
+    # The weight block has a different size for each weight type, so the start of every vertex has to be found first
+    sizes = [prefix_size + size for num_bones, num_floats, size in layouts]
+    offsets = [0] * count
+    weight_types = bytearray(count)
+    pos = 0
+    try:
+        for i in range(count):
+            offsets[i] = pos
+            weight_type = data[pos + prefix_size]
+            weight_types[i] = weight_type
+            pos += sizes[weight_type]
+    except IndexError:
+        if pos + prefix_size < len(data):
+            raise ValueError('invalid weight type %s'%str(data[pos + prefix_size]))
+        raise struct.error('unpack requires more vertex data')
+    if pos > len(data):
+        raise struct.error('unpack requires more vertex data')
+    return np.array(offsets, dtype=np.int64), np.frombuffer(weight_types, dtype=np.uint8), pos
+
+def _columnProperty(name):
+    # a property which reads and writes the row of the view in the column name
+    def getter(self):
+        return tuple(getattr(self._arrays, name)[self._index].tolist())
+    def setter(self, value):
+        getattr(self._arrays, name)[self._index] = value
+    return property(getter, setter)
+
+def _scalarProperty(name, column_index=None):
+    def getter(self):
+        column = getattr(self._arrays, name)
+        return (column[self._index] if column_index is None else column[self._index, column_index]).item()
+    def setter(self, value):
+        column = getattr(self._arrays, name)
+        if column_index is None:
+            column[self._index] = value
+        else:
+            column[self._index, column_index] = value
+    return property(getter, setter)
+
+class VertexView(Vertex):
+    """ A Vertex which reads and writes one row of a VertexArrays. """
+    __slots__ = ('_arrays', '_index')
+
+    def __init__(self, arrays, index):
+        self._arrays = arrays
+        self._index = index
+
+    co = _columnProperty('co')
+    normal = _columnProperty('normal')
+    uv = _columnProperty('uv')
+    edge_scale = _scalarProperty('edge_scale')
+
+    @property
+    def additional_uvs(self):
+        return [tuple(uv) for uv in self._arrays.additional_uvs[self._index].tolist()]
+
+    @additional_uvs.setter
+    def additional_uvs(self, value):
+        self._arrays.additional_uvs[self._index] = 0
+        for i, uv in enumerate(value):
+            self._arrays.additional_uvs[self._index, i] = uv
+
+    @property
+    def weight(self):
+        return BoneWeightView(self._arrays, self._index)
+
+    @weight.setter
+    def weight(self, value):
+        self._arrays.setWeight(self._index, value)
+
+class BoneWeightView(BoneWeight):
+    """ A BoneWeight which reads and writes one row of a VertexArrays. bones returns a copy. """
+    __slots__ = ('_arrays', '_index')
+
+    BONE_COUNTS = {BoneWeight.BDEF1: 1, BoneWeight.BDEF2: 2, BoneWeight.BDEF4: 4, BoneWeight.SDEF: 2}
+
+    def __init__(self, arrays, index):
+        self._arrays = arrays
+        self._index = index
+
+    type = _scalarProperty('weight_type')
+
+    @property
+    def bones(self):
+        return self._arrays.bones[self._index, :self.BONE_COUNTS[self.type]].tolist()
+
+    @bones.setter
+    def bones(self, value):
+        self._arrays.bones[self._index] = -1
+        self._arrays.bones[self._index, :len(value)] = value
+
+    @property
+    def weights(self):
+        weight_type = self.type
+        if weight_type == self.BDEF1:
+            return []
+        elif weight_type == self.BDEF2:
+            return self._arrays.weights[self._index, :1].tolist()
+        elif weight_type == self.BDEF4:
+            return tuple(self._arrays.weights[self._index].tolist())
+        return BoneWeightSDEFView(self._arrays, self._index)
+
+    @weights.setter
+    def weights(self, value):
+        weights = self._arrays.weights
+        weights[self._index] = 0
+        if isinstance(value, BoneWeightSDEF):
+            sdef = BoneWeightSDEFView(self._arrays, self._index)
+            sdef.weight, sdef.c, sdef.r0, sdef.r1 = value.weight, value.c, value.r0, value.r1
+        elif len(value):
+            weights[self._index, :len(value)] = value
+
+class BoneWeightSDEFView(BoneWeightSDEF):
+    """ A BoneWeightSDEF which reads and writes one row of a VertexArrays. """
+    __slots__ = ('_arrays', '_index')
+
+    def __init__(self, arrays, index):
+        self._arrays = arrays
+        self._index = index
+
+    weight = _scalarProperty('weights', 0)
+    c = _columnProperty('sdef_c')
+    r0 = _columnProperty('sdef_r0')
+    r1 = _columnProperty('sdef_r1')
+
 class Texture:
     def __init__(self):
         self.path = ''
@@ -810,6 +1199,13 @@ class Material:
     SPHERE_MODE_ADD = 2
     SPHERE_MODE_SUBTEX = 3
 
+    __slots__ = (
+        'name', 'name_e', 'diffuse', 'specular', 'shininess', 'ambient',
+        'is_double_sided', 'enabled_drop_shadow', 'enabled_self_shadow_map', 'enabled_self_shadow', 'enabled_toon_edge',
+        'edge_color', 'edge_size', 'texture', 'sphere_texture', 'sphere_texture_mode', 'is_shared_toon_texture', 'toon_texture',
+        'comment', 'vertex_count',
+        )
+
     def __init__(self):
         self.name = ''
         self.name_e = ''
@@ -1193,12 +1589,17 @@ class VertexMorph(Morph):
 
     def load(self, fs):
         num = fs.readInt()
+        if np is not None:
+            self.offsets = RecordList(VertexMorphOffsetArrays.load(fs, num))
+            return
         for i in range(num):
             t = VertexMorphOffset()
             t.load(fs)
             self.offsets.append(t)
 
 class VertexMorphOffset:
+    __slots__ = ('index', 'offset')
+
     def __init__(self):
         self.index = 0
         self.offset = []
@@ -1211,6 +1612,55 @@ class VertexMorphOffset:
         fs.writeVertexIndex(self.index)
         fs.writeVector(self.offset)
 
+class VertexMorphOffsetArrays(RecordArrays):
+    """ The offsets of a vertex morph as columns. An index of -1 is stored for offsets without an index (None). """
+    COLUMNS = ('index', 'offset')
+
+    def __init__(self, count):
+        self.index = np.zeros(count, dtype=np.int64)
+        self.offset = np.zeros((count, 3), dtype=np.float32)
+
+    @classmethod
+    def load(cls, fs, count):
+        size = fs.header().vertex_index_size
+        if size not in _UNSIGNED_ARRAY_TYPES:
+            raise ValueError('invalid data size %s'%str(size))
+        record = np.dtype([('index', _UNSIGNED_ARRAY_TYPES[size]), ('offset', '<f4', (3,))])
+        records = np.frombuffer(fs.readBuffer(record.itemsize*count), dtype=record)
+        offset_arrays = cls(count)
+        offset_arrays.index[:] = records['index']
+        offset_arrays.offset[:] = records['offset']
+        return offset_arrays
+
+    def view(self, index):
+        return VertexMorphOffsetView(self, index)
+
+    def setRecord(self, index, record):
+        if getattr(record, '_arrays', None) is self:
+            self.copyRow(index, record._index)
+            return
+        self.index[index] = -1 if record.index is None else record.index
+        self.offset[index] = record.offset
+
+class VertexMorphOffsetView(VertexMorphOffset):
+    """ A VertexMorphOffset which reads and writes one row of a VertexMorphOffsetArrays. """
+    __slots__ = ('_arrays', '_index')
+
+    def __init__(self, arrays, index):
+        self._arrays = arrays
+        self._index = index
+
+    offset = _columnProperty('offset')
+
+    @property
+    def index(self):
+        index = self._arrays.index[self._index].item()
+        return None if index < 0 else index
+
+    @index.setter
+    def index(self, value):
+        self._arrays.index[self._index] = -1 if value is None else value
+
 class UVMorph(Morph):
     def __init__(self, *args, **kwargs):
         self.uv_index = kwargs.get('type_index', 3) - 3
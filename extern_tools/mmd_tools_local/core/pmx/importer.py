@@ -5,6 +5,7 @@ import logging
 import time
 
 import bpy
+import numpy as np
 from mathutils import Vector, Matrix
 
 import mmd_tools_local.core.model as mmd_model
@@ -56,7 +57,8 @@ class PMXImporter:
         self.__materialTable = []
         self.__imageTable = {}
 
-        self.__sdefVertices = {} # pmx vertices
+        self.__vertexArrays = None # pmx vertices as columns
+        self.__sdefVertices = None # mesh and pmx indices of the SDEF vertices
         self.__blender_ik_links = set()
         self.__vertex_map = None
 
@@ -112,71 +114,104 @@ class PMXImporter:
         vgroups = self.__meshObj.vertex_groups
         self.__vertexGroupTable = [vgroups.new(name=i.name) for i in self.__model.bones] or [vgroups.new(name='NO BONES')]
 
+    def __getVertexArrays(self):
+        """ Return the pmx vertices as VertexArrays and the pmx index of every vertex of the mesh.
+        """
+        pmx_vertices = self.__model.vertices
+        if isinstance(pmx_vertices, pmx.RecordList):
+            vertex_arrays = pmx_vertices.arrays
+        else:
+            vertex_arrays = pmx.VertexArrays(len(pmx_vertices))
+            for i, pv in enumerate(pmx_vertices):
+                vertex_arrays.setRecord(i, pv)
+
+        if self.__vertex_map:
+            indices = np.fromiter(collections.OrderedDict(self.__vertex_map).keys(), dtype=np.int64)
+        else:
+            indices = np.arange(len(vertex_arrays))
+        return vertex_arrays, indices
+
+    @staticmethod
+    def __addVertexWeights(vertex_groups, group_indices, vertex_indices, weights, add_type):
+        """ Add the weights with one add() call for every vertex group and weight value.
+        """
+        order = np.lexsort((vertex_indices, weights, group_indices))
+        group_indices, vertex_indices, weights = group_indices[order], vertex_indices[order], weights[order]
+        starts = np.flatnonzero(np.r_[True, (group_indices[1:] != group_indices[:-1]) | (weights[1:] != weights[:-1])])
+        ends = np.r_[starts[1:], len(weights)]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            vertex_groups[group_indices[start]].add(index=vertex_indices[start:end].tolist(), weight=weights[start].item(), type=add_type)
+
     def __importVertices(self):
         self.__importVertexGroup()
 
-        pmxModel = self.__model
-        pmx_vertices = pmxModel.vertices
-        vertex_count = len(pmx_vertices)
-        vertex_map = self.__vertex_map
-        if vertex_map:
-            indices = collections.OrderedDict(vertex_map).keys()
-            pmx_vertices = tuple(pmxModel.vertices[x] for x in indices)
-            vertex_count = len(indices)
+        vertex_arrays, indices = self.__getVertexArrays()
+        vertex_count = len(indices)
         if vertex_count < 1:
             return
 
         mesh = self.__meshObj.data
         mesh.vertices.add(count=vertex_count)
-        mesh.vertices.foreach_set('co', tuple(i for pv in pmx_vertices for i in (Vector(pv.co).xzy * self.__scale)))
+        mesh.vertices.foreach_set('co', (vertex_arrays.co[indices][:, (0, 2, 1)] * self.__scale).ravel())
+
+        # the bone with the lower index comes first in SDEF vertices
+        weight_type = vertex_arrays.weight_type[indices]
+        is_sdef = weight_type == pmx.BoneWeight.SDEF
+        sdef_indices = indices[is_sdef]
+        flip = sdef_indices[vertex_arrays.bones[sdef_indices, 0] > vertex_arrays.bones[sdef_indices, 1]]
+        vertex_arrays.bones[flip, :2] = vertex_arrays.bones[flip, 1::-1]
+        vertex_arrays.weights[flip, 0] = 1.0 - vertex_arrays.weights[flip, 0]
+        vertex_arrays.sdef_r0[flip], vertex_arrays.sdef_r1[flip] = vertex_arrays.sdef_r1[flip], vertex_arrays.sdef_r0[flip]
+        self.__vertexArrays = vertex_arrays
+        self.__sdefVertices = (np.flatnonzero(is_sdef), sdef_indices)
+
+        # BDEF1 uses the first bone, BDEF2 and SDEF the first two bones and BDEF4 all bones
+        bones = vertex_arrays.bones[indices]
+        weights = vertex_arrays.weights[indices].astype(np.float64)
+        is_bdef1 = weight_type == pmx.BoneWeight.BDEF1
+        is_two_bones = (weight_type == pmx.BoneWeight.BDEF2) | is_sdef
+        weights[is_bdef1, 0] = 1.0
+        weights[is_two_bones, 1] = 1.0 - weights[is_two_bones, 0]
+        used = np.zeros(bones.shape, dtype=bool)
+        used[is_bdef1, 0] = bones[is_bdef1, 0] >= 0
+        used[is_two_bones, :2] = True
+        used[weight_type == pmx.BoneWeight.BDEF4] = True
+        vertex_indices = np.broadcast_to(np.arange(vertex_count)[:, None], bones.shape)
+        self.__addVertexWeights(self.__vertexGroupTable, bones[used], vertex_indices[used], weights[used], 'ADD')
 
-        vertex_group_table = self.__vertexGroupTable
         vg_edge_scale = self.__meshObj.vertex_groups.new(name='mmd_edge_scale')
         vg_vertex_order = self.__meshObj.vertex_groups.new(name='mmd_vertex_order')
-        for i, pv in enumerate(pmx_vertices):
-            pv_bones, pv_weights, idx = pv.weight.bones, pv.weight.weights, (i,)
-
-            vg_edge_scale.add(index=idx, weight=pv.edge_scale, type='REPLACE')
-            vg_vertex_order.add(index=idx, weight=i/vertex_count, type='REPLACE')
-
-            if isinstance(pv_weights, pmx.BoneWeightSDEF):
-                if pv_bones[0] > pv_bones[1]:
-                    pv_bones.reverse()
-                    pv_weights.weight = 1.0 - pv_weights.weight
-                    pv_weights.r0, pv_weights.r1 = pv_weights.r1, pv_weights.r0
-                vertex_group_table[pv_bones[0]].add(index=idx, weight=pv_weights.weight, type='ADD')
-                vertex_group_table[pv_bones[1]].add(index=idx, weight=1.0-pv_weights.weight, type='ADD')
-                self.__sdefVertices[i] = pv
-            elif len(pv_bones) == 1:
-                bone_index = pv_bones[0]
-                if bone_index >= 0:
-                    vertex_group_table[bone_index].add(index=idx, weight=1.0, type='ADD')
-            elif len(pv_bones) == 2:
-                vertex_group_table[pv_bones[0]].add(index=idx, weight=pv_weights[0], type='ADD')
-                vertex_group_table[pv_bones[1]].add(index=idx, weight=1.0-pv_weights[0], type='ADD')
-            elif len(pv_bones) == 4:
-                for bone, weight in zip(pv_bones, pv_weights):
-                    vertex_group_table[bone].add(index=idx, weight=weight, type='ADD')
-            else:
-                raise Exception('unkown bone weight type.')
+        group_indices = np.zeros(vertex_count, dtype=np.int64)
+        self.__addVertexWeights([vg_edge_scale], group_indices, np.arange(vertex_count),
+                                vertex_arrays.edge_scale[indices].astype(np.float64), 'REPLACE')
+        self.__addVertexWeights([vg_vertex_order], group_indices, np.arange(vertex_count),
+                                np.arange(vertex_count) / vertex_count, 'REPLACE')
 
         vg_edge_scale.lock_weight = True
         vg_vertex_order.lock_weight = True
 
+    def __basisCoordinates(self):
+        """ Return the coordinates of the basis shape key as a (vertex count, 3) array.
+        """
+        key_data = self.__meshObj.data.shape_keys.reference_key.data
+        co = np.empty(len(key_data)*3, dtype=np.float32)
+        key_data.foreach_get('co', co)
+        return co.reshape(-1, 3)
+
     def __storeVerticesSDEF(self):
-        if len(self.__sdefVertices) < 1:
+        if self.__sdefVertices is None or len(self.__sdefVertices[0]) < 1:
             return
 
+        mesh_indices, pmx_indices = self.__sdefVertices
+        vertex_arrays = self.__vertexArrays
         self.__createBasisShapeKey()
-        sdefC = self.__meshObj.shape_key_add(name='mmd_sdef_c')
-        sdefR0 = self.__meshObj.shape_key_add(name='mmd_sdef_r0')
-        sdefR1 = self.__meshObj.shape_key_add(name='mmd_sdef_r1')
-        for i, pv in self.__sdefVertices.items():
-            w = pv.weight.weights
-            sdefC.data[i].co = Vector(w.c).xzy * self.__scale
-            sdefR0.data[i].co = Vector(w.r0).xzy * self.__scale
-            sdefR1.data[i].co = Vector(w.r1).xzy * self.__scale
-        logging.info('Stored %d SDEF vertices', len(self.__sdefVertices))
+        basis_co = self.__basisCoordinates()
+        for name, column in (('mmd_sdef_c', vertex_arrays.sdef_c), ('mmd_sdef_r0', vertex_arrays.sdef_r0), ('mmd_sdef_r1', vertex_arrays.sdef_r1)):
+            shapeKey = self.__meshObj.shape_key_add(name=name)
+            co = basis_co.copy()
+            co[mesh_indices] = column[pmx_indices][:, (0, 2, 1)] * self.__scale
+            shapeKey.data.foreach_set('co', co.ravel())
+        logging.info('Stored %d SDEF vertices', len(mesh_indices))
 
     def __importTextures(self):
         pmxModel = self.__model
@@ -653,19 +688,30 @@ class PMXImporter:
                     materials[mi].show_transparent_back = False
                     mi_skip = mi
 
+    @staticmethod
+    def __vertexMorphOffsets(offsets):
+        """ Return the vertex indices and the offsets of a vertex morph as arrays.
+        """
+        if isinstance(offsets, pmx.RecordList):
+            return offsets.arrays.index, offsets.arrays.offset
+        indices = np.fromiter((x.index for x in offsets), dtype=np.int64, count=len(offsets))
+        return indices, np.array([x.offset for x in offsets], dtype=np.float32).reshape(-1, 3)
+
     def __importVertexMorphs(self):
         mmd_root = self.__root.mmd_root
         categories = self.CATEGORIES
         self.__createBasisShapeKey()
+        basis_co = self.__basisCoordinates()
         for morph in (x for x in self.__model.morphs if isinstance(x, pmx.VertexMorph)):
             shapeKey = self.__meshObj.shape_key_add(name=morph.name)
             vtx_morph = mmd_root.vertex_morphs.add()
             vtx_morph.name = morph.name
             vtx_morph.name_e = morph.name_e
             vtx_morph.category = categories.get(morph.category, 'OTHER')
-            for md in morph.offsets:
-                shapeKeyPoint = shapeKey.data[md.index]
-                shapeKeyPoint.co += Vector(md.offset).xzy * self.__scale
+            indices, offsets = self.__vertexMorphOffsets(morph.offsets)
+            co = basis_co.copy()
+            np.add.at(co, indices, offsets[:, (0, 2, 1)] * self.__scale)
+            shapeKey.data.foreach_set('co', co.ravel())
 
     def __importMaterialMorphs(self):
         mmd_root = self.__root.mmd_root
@@ -40,6 +40,75 @@ class TestAddon(unittest.TestCase):
         result = bpy.ops.cats_armature.fix()
         self.assertTrue(result == {'FINISHED'})
 
+    def test_meshes_index(self):
+        from cats.tools import common as Common
+
+        def scan():
+            armature_name = Common.get_armature().name
+            return [ob for ob in Common.get_objects() if ob.type == 'MESH' and armature_name in Common.get_mesh_armature_names(ob)]
+
+        self.assertEqual(scan(), Common.get_meshes_objects(check=False))
+
+        # Removed and renamed meshes have to be noticed before the handlers run
+        meshes = Common.get_meshes_objects(check=False)
+        if meshes:
+            # Reparenting keeps the object count, the mesh has to leave and rejoin the armature anyway
+            parent = meshes[0].parent
+            meshes[0].parent = None
+            self.assertEqual(scan(), Common.get_meshes_objects(check=False))
+            meshes[0].parent = parent
+            self.assertEqual(scan(), Common.get_meshes_objects(check=False))
+
+            meshes[0].name = meshes[0].name + '.renamed'
+            self.assertEqual(scan(), Common.get_meshes_objects(check=False))
+            Common.delete(meshes[-1])
+            self.assertEqual(scan(), Common.get_meshes_objects(check=False))
+
+    def test_weight_transfer(self):
+        from cats.tools import common as Common
+
+        meshes = [mesh for mesh in Common.get_meshes_objects(check=False) if len(mesh.vertex_groups) >= 4]
+        if not meshes:
+            return
+
+        # Mix the same groups with the modifier and with the batched transfer on two copies of the mesh
+        copies = []
+        for i in range(2):
+            copy = meshes[0].copy()
+            copy.data = meshes[0].data.copy()
+            bpy.context.scene.collection.objects.link(copy)
+            copies.append(copy)
+
+        names = [vg.name for vg in copies[0].vertex_groups]
+        operations = [
+            (names[0], names[1], 1.0, 'ADD', True),
+            (names[1], names[2], 0.25, 'ADD', False),
+            (names[2], names[2], 0.2, 'SUB', False),
+            (names[3], names[2], 0.5, 'SET', True),
+        ]
+
+        Common.set_default_stage()
+        Common.set_active(copies[0])
+        for operation in operations:
+            Common.mix_weights(copies[0], *operation)
+        with Common.weight_transfer(copies[1]):
+            for operation in operations:
+                Common.mix_weights(copies[1], *operation)
+
+        def read(mesh):
+            names = {vg.index: vg.name for vg in mesh.vertex_groups}
+            return {(v.index, names[g.group]): g.weight for v in mesh.data.vertices for g in v.groups}
+
+        self.assertEqual([vg.name for vg in copies[0].vertex_groups], [vg.name for vg in copies[1].vertex_groups])
+        weights_modifier = read(copies[0])
+        weights_transfer = read(copies[1])
+        self.assertEqual(weights_modifier.keys(), weights_transfer.keys())
+        for key, weight in weights_modifier.items():
+            self.assertAlmostEqual(weight, weights_transfer[key], places=5)
+
+        for copy in copies:
+            Common.delete(copy)
+
 
 suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestAddon)
 runner = unittest.TextTestRunner()
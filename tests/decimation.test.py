@@ -0,0 +1,184 @@
+# MIT License
+
+# Copyright (c) 2017 GiveMeAllYourCats
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Code author: GiveMeAllYourCats
+# Repo: https://github.com/michaeldegroot/cats-blender-plugin
+# Edits by: GiveMeAllYourCats
+
+import os
+import json
+import tempfile
+import unittest
+import random
+import sys
+import bpy
+
+from cats.tools import common as Common
+from cats.tools import armature_bones as Bones
+from cats.tools import decimation as Decimation
+
+
+class TestAddon(unittest.TestCase):
+    def test_solve_decimation_ratios(self):
+        # Meshes that collapse slower or faster than the ratio, and one that stops collapsing at 40%
+        tris_counts = {'Body': 40000, 'Hair': 25000, 'Clothes': 15000}
+        exponents = {'Body': 0.8, 'Hair': 1.3, 'Clothes': 1.0}
+        floors = {'Body': 0, 'Hair': 10000, 'Clothes': 0}
+
+        def measure(ratios):
+            return {name: max(floors[name], int(tris_counts[name] * ratio ** exponents[name])) for name, ratio in ratios.items()}
+
+        budget = 32000
+        plan = Decimation.solve_decimation_ratios(tris_counts, budget, measure, tolerance=0.005 * budget)
+        planned_tris = sum(tris for _, tris in plan.values())
+        self.assertLessEqual(abs(planned_tris - budget), 0.005 * budget)
+        for name, (ratio, tris) in plan.items():
+            self.assertTrue(0 <= ratio <= 1)
+            self.assertEqual(tris, measure({name: ratio})[name])
+
+    def test_decimation_hits_budget(self):
+        bpy.ops.cats_armature.fix()
+
+        current_tris = sum(Common.get_tricount(mesh) for mesh in Common.get_meshes_objects())
+        max_tris = current_tris // 2
+
+        bpy.context.scene.decimation_mode = 'FULL'
+        bpy.context.scene.decimate_fingers = False
+        bpy.context.scene.decimation_animation_weighting = False
+        bpy.context.scene.max_tris = max_tris
+        result = bpy.ops.cats_decimation.auto_decimate()
+        self.assertTrue(result == {'FINISHED'})
+
+        # The plan is measured with the same modifier that gets applied, so the result has to match it
+        tris = sum(Common.get_tricount(mesh) for mesh in Common.get_meshes_objects())
+        self.assertLessEqual(abs(tris - max_tris), Decimation.plan_tolerance * max_tris + 1)
+
+    def test_decimation_protects_fingers(self):
+        bpy.ops.cats_armature.fix()
+
+        # The finger mask has to contain exactly the vertices that are assigned to a finger group
+        for mesh in Common.get_meshes_objects():
+            finger_groups = {mesh.vertex_groups[finger + side].index for finger in Bones.bone_finger_list for side in ('L', 'R')
+                             if finger + side in mesh.vertex_groups}
+            expected = [any(group.group in finger_groups for group in vertex.groups) for vertex in mesh.data.vertices]
+            self.assertEqual(expected, Decimation.get_finger_mask(mesh).tolist())
+
+        def count():
+            meshes = Common.get_meshes_objects()
+            return sum(len(mesh.data.vertices) for mesh in meshes), sum(int(Decimation.get_finger_mask(mesh).sum()) for mesh in meshes)
+
+        current_tris = sum(Common.get_tricount(mesh) for mesh in Common.get_meshes_objects())
+        vertices_before, fingers_before = count()
+
+        bpy.context.scene.decimation_mode = 'FULL'
+        bpy.context.scene.decimate_fingers = True
+        bpy.context.scene.max_tris = current_tris // 2
+        result = bpy.ops.cats_decimation.auto_decimate()
+        self.assertTrue(result == {'FINISHED'})
+
+        # The temporary weights group has to be gone again
+        for mesh in Common.get_meshes_objects():
+            self.assertIsNone(mesh.vertex_groups.get("CATS Animation"))
+
+        # The protected fingers get collapsed last, so they have to keep more of their vertices than the rest of the model
+        vertices_after, fingers_after = count()
+        if fingers_before:
+            self.assertGreater(fingers_after / fingers_before, vertices_after / vertices_before)
+
+    def test_analyze_decimation(self):
+        bpy.ops.cats_armature.fix()
+        bpy.context.scene.max_tris = 10000
+
+        tris_before = sum(Common.get_tricount(mesh) for mesh in Common.get_meshes_objects())
+        filepath = os.path.join(tempfile.mkdtemp(), 'decimation_analysis.json')
+        result = bpy.ops.cats_decimation.analyze(filepath=filepath)
+        self.assertTrue(result == {'FINISHED'})
+
+        # Nothing may change, the report only predicts the result
+        self.assertEqual(tris_before, sum(Common.get_tricount(mesh) for mesh in Common.get_meshes_objects()))
+
+        with open(filepath, encoding="utf8") as file:
+            analysis = json.load(file)
+        self.assertEqual(analysis['current_tris'], tris_before)
+        self.assertEqual(sorted(analysis['modes']), sorted(Decimation.analysis_modes))
+        for mode, result in analysis['modes'].items():
+            self.assertEqual(result['projected_tris'], sum(mesh['modes'][mode]['projected_tris'] for mesh in analysis['meshes']))
+            if result['fits']:
+                self.assertLessEqual(result['projected_tris'], 10000 + len(analysis['meshes']))
+
+    def test_repair_shape_keys(self):
+        bpy.ops.cats_armature.fix()
+
+        meshes = [mesh for mesh in Common.get_meshes_objects() if Common.has_shapekeys(mesh)
+                  and len(mesh.data.shape_keys.key_blocks) > 2]
+        if not meshes:
+            return
+
+        # Repair two copies of the same mesh, one with the old operator path and one with the array path
+        original = meshes[0]
+        copies = []
+        for _ in range(2):
+            copy = original.copy()
+            copy.data = original.data.copy()
+            bpy.context.collection.objects.link(copy)
+            copies.append(copy)
+
+        for mesh in copies:
+            Common.set_default_stage()
+            Common.set_active(mesh)
+            mesh.active_shape_key_index = 0
+            bpy.ops.object.shape_key_add(from_mix=False)
+            mesh.active_shape_key.name = "CATS Basis"
+            mesh.active_shape_key_index = 0
+
+        # Move the CATS Basis like a decimation would and only keep some vertices selected
+        random.seed(0)
+        offsets = [random.uniform(-0.01, 0.01) for _ in range(len(original.data.vertices) * 3)]
+        selection = [random.random() < 0.8 for _ in range(len(original.data.vertices))]
+        for mesh in copies:
+            cats_basis = mesh.data.shape_keys.key_blocks["CATS Basis"]
+            co = [0.0] * len(offsets)
+            cats_basis.data.foreach_get('co', co)
+            cats_basis.data.foreach_set('co', [value + offset for value, offset in zip(co, offsets)])
+            mesh.data.vertices.foreach_set('select', selection)
+
+        operator_mesh, array_mesh = copies
+        Common.set_default_stage()
+        Common.set_active(operator_mesh)
+        for idx in range(1, len(operator_mesh.data.shape_keys.key_blocks) - 1):
+            operator_mesh.active_shape_key_index = idx
+            Common.switch('EDIT')
+            bpy.ops.mesh.blend_from_shape(shape="CATS Basis", blend=-1.0, add=True)
+            Common.switch('OBJECT')
+
+        Decimation.repair_shape_keys(array_mesh)
+
+        for operator_kb, array_kb in zip(operator_mesh.data.shape_keys.key_blocks, array_mesh.data.shape_keys.key_blocks):
+            self.assertEqual(operator_kb.name, array_kb.name)
+            for v0, v1 in zip(operator_kb.data, array_kb.data):
+                self.assertLess((v0.co - v1.co).length, 1e-5, operator_kb.name)
+
+
+suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestAddon)
+runner = unittest.TextTestRunner()
+ret = not runner.run(suite).wasSuccessful()
+sys.exit(ret)
@@ -0,0 +1,283 @@
+# MIT License
+
+# Copyright (c) 2017 GiveMeAllYourCats
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Code author: GiveMeAllYourCats
+# Repo: https://github.com/michaeldegroot/cats-blender-plugin
+# Edits by: GiveMeAllYourCats
+
+import os
+import sys
+import random
+import struct
+import tempfile
+import unittest
+
+import bpy
+from mmd_tools_local.core import pmx
+from mmd_tools_local.core import pmd
+
+
+def create_model(vertex_count, additional_uvs=0, bone_count=300, seed=0):
+    # A model with every weight type and only the data the vertex and face sections need
+    rng = random.Random(seed)
+    model = pmx.Model()
+    model.name = 'Synthetic'
+
+    for i in range(bone_count):
+        bone = pmx.Bone()
+        bone.name = 'Bone' + str(i)
+        bone.location = [0, i, 0]
+        bone.parent = i - 1
+        model.bones.append(bone)
+
+    for i in range(vertex_count):
+        vertex = pmx.Vertex()
+        vertex.co = [rng.uniform(-1, 1) for _ in range(3)]
+        vertex.normal = [rng.uniform(-1, 1) for _ in range(3)]
+        vertex.uv = [rng.random(), rng.random()]
+        vertex.additional_uvs = [[rng.random() for _ in range(4)] for _ in range(additional_uvs)]
+        vertex.edge_scale = rng.random()
+
+        weight = vertex.weight = pmx.BoneWeight()
+        weight.type = i % 4
+        bone_indices = [rng.randrange(-1, bone_count) for _ in range(4)]
+        if weight.type == pmx.BoneWeight.BDEF1:
+            weight.bones = bone_indices[:1]
+        elif weight.type == pmx.BoneWeight.BDEF2:
+            weight.bones = bone_indices[:2]
+            weight.weights = [rng.random()]
+        elif weight.type == pmx.BoneWeight.BDEF4:
+            weight.bones = bone_indices
+            weight.weights = [rng.random() for _ in range(4)]
+        else:
+            weight.bones = bone_indices[:2]
+            weight.weights = pmx.BoneWeightSDEF(rng.random(), [rng.random() for _ in range(3)],
+                                                [rng.random() for _ in range(3)], [rng.random() for _ in range(3)])
+        model.vertices.append(vertex)
+
+    model.faces = [tuple(rng.randrange(vertex_count) for _ in range(3)) for _ in range(vertex_count)]
+
+    if vertex_count:
+        morph = pmx.VertexMorph('Morph', 'Morph', 1)
+        for i in range(0, vertex_count, 3):
+            offset = pmx.VertexMorphOffset()
+            offset.index = i
+            offset.offset = [rng.uniform(-1, 1) for _ in range(3)]
+            morph.offsets.append(offset)
+        model.morphs.append(morph)
+
+    material = pmx.Material()
+    material.name = 'Material'
+    material.diffuse = [1, 1, 1, 1]
+    material.specular = [0, 0, 0]
+    material.ambient = [0.5, 0.5, 0.5]
+    material.edge_color = [0, 0, 0, 1]
+    material.vertex_count = len(model.faces) * 3
+    model.materials.append(material)
+    return model
+
+
+def vertex_key(vertex):
+    weight = vertex.weight
+    weights = weight.weights
+    if isinstance(weights, pmx.BoneWeightSDEF):
+        weights = (weights.weight, tuple(weights.c), tuple(weights.r0), tuple(weights.r1))
+    return (tuple(vertex.co), tuple(vertex.normal), tuple(vertex.uv), [tuple(uv) for uv in vertex.additional_uvs],
+            weight.type, list(weight.bones), tuple(weights), vertex.edge_scale)
+
+
+class TestAddon(unittest.TestCase):
+    def load(self, path, bulk):
+        numpy = pmx.np
+        if not bulk:
+            pmx.np = None
+        try:
+            return pmx.load(path)
+        finally:
+            pmx.np = numpy
+
+    def test_bulk_vertex_decoder(self):
+        for vertex_count, additional_uvs, bone_count in [(0, 0, 3), (1, 0, 3), (500, 2, 300), (500, 4, 70000)]:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, 'synthetic.pmx')
+                pmx.save(path, create_model(vertex_count, additional_uvs, bone_count), add_uv_count=additional_uvs)
+                model_stream = self.load(path, bulk=False)
+                model_bulk = self.load(path, bulk=True)
+
+            self.assertIsInstance(model_bulk.vertices, pmx.RecordList)
+            self.assertEqual(len(model_bulk.vertices), vertex_count)
+            self.assertEqual([vertex_key(v) for v in model_stream.vertices], [vertex_key(v) for v in model_bulk.vertices])
+            self.assertEqual(model_stream.faces, model_bulk.faces)
+            self.assertEqual([m.name for m in model_stream.materials], [m.name for m in model_bulk.materials])
+            self.assertEqual([[(o.index, tuple(o.offset)) for o in m.offsets] for m in model_stream.morphs],
+                             [[(o.index, tuple(o.offset)) for o in m.offsets] for m in model_bulk.morphs])
+
+    def test_record_list(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'synthetic.pmx')
+            pmx.save(path, create_model(8, 1), add_uv_count=1)
+            model_stream = self.load(path, bulk=False)
+            model_bulk = self.load(path, bulk=True)
+            extra_vertex = self.load(path, bulk=False).vertices[5]
+        vertices = model_stream.vertices
+        vertices_bulk = model_bulk.vertices
+
+        # The list works like a normal list of vertices, views write to the columns.
+        # Items are copied into their rows, so unlike a list the same vertex is never shared by two indices.
+        for index in [-1, 3, 1]:
+            del vertices[index]
+            del vertices_bulk[index]
+        vertices.insert(1, vertices[3])
+        vertices_bulk.insert(1, vertices_bulk[3])
+        vertices[0] = vertices[2]
+        vertices_bulk[0] = vertices_bulk[2]
+        vertices.append(extra_vertex)
+        vertices_bulk.append(extra_vertex)
+        vertices[3].co = [1.0, 2.0, 3.0]
+        vertices_bulk[3].co = [1.0, 2.0, 3.0]
+        vertices[3].weight.bones = [5] * len(vertices[3].weight.bones)
+        vertices_bulk[3].weight.bones = [5] * len(vertices_bulk[3].weight.bones)
+        self.assertEqual([vertex_key(v) for v in vertices], [vertex_key(v) for v in vertices_bulk])
+        self.assertEqual([vertex_key(v) for v in vertices[1:5]], [vertex_key(v) for v in vertices_bulk[1:5]])
+        self.assertEqual(len(vertices_bulk.arrays), len(vertices))
+        with self.assertRaises(IndexError):
+            vertices_bulk[len(vertices)]
+
+        offsets = model_bulk.morphs[0].offsets
+        offsets[0].index = None
+        self.assertIsNone(offsets[0].index)
+        self.assertEqual(len([x for x in offsets if x.index is not None]), len(offsets) - 1)
+        offsets[0].index = 2
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'edited.pmx')
+            pmx.save(path, model_bulk, add_uv_count=1)
+            model_saved = self.load(path, bulk=False)
+        self.assertEqual([vertex_key(v) for v in vertices], [vertex_key(v) for v in model_saved.vertices])
+        self.assertEqual(model_saved.morphs[0].offsets[0].index, 2)
+
+    def test_import_vertex_weights(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'synthetic.pmx')
+            pmx.save(path, create_model(300, bone_count=20))
+            model = self.load(path, bulk=False)
+
+            meshes = {obj for obj in bpy.data.objects if obj.type == 'MESH'}
+            bpy.ops.mmd_tools.import_model('EXEC_DEFAULT', filepath=path, scale=0.08, types={'MESH', 'ARMATURE'}, log_level='WARNING')
+            mesh = [obj for obj in bpy.data.objects if obj.type == 'MESH' and obj not in meshes][0]
+
+        # The weights every vertex should get, bones of BDEF2, BDEF4 and SDEF vertices are added up
+        bone_names = [bone.name for bone in model.bones]
+        for i, vertex in enumerate(model.vertices):
+            weight = vertex.weight
+            if weight.type == pmx.BoneWeight.BDEF1:
+                pairs = [(weight.bones[0], 1.0)] if weight.bones[0] >= 0 else []
+            elif weight.type == pmx.BoneWeight.BDEF4:
+                pairs = zip(weight.bones, weight.weights)
+            else:
+                w = weight.weights.weight if weight.type == pmx.BoneWeight.SDEF else weight.weights[0]
+                bones = weight.bones
+                if weight.type == pmx.BoneWeight.SDEF and bones[0] > bones[1]:
+                    bones, w = bones[::-1], 1.0 - w
+                pairs = [(bones[0], w), (bones[1], 1.0 - w)]
+
+            expected = {}
+            for bone, w in pairs:
+                name = bone_names[bone]
+                expected[name] = min(expected.get(name, 0.0) + w, 1.0)
+            expected['mmd_edge_scale'] = vertex.edge_scale
+            expected['mmd_vertex_order'] = i / len(model.vertices)
+
+            groups = {mesh.vertex_groups[g.group].name: g.weight for g in mesh.data.vertices[i].groups}
+            self.assertEqual(set(groups), set(expected))
+            for name, w in expected.items():
+                self.assertAlmostEqual(groups[name], w, places=5)
+
+    def test_import_shape_keys(self):
+        scale = 0.08
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'synthetic.pmx')
+            pmx.save(path, create_model(300, bone_count=20))
+            model = self.load(path, bulk=False)
+
+            meshes = {obj for obj in bpy.data.objects if obj.type == 'MESH'}
+            bpy.ops.mmd_tools.import_model('EXEC_DEFAULT', filepath=path, scale=scale, types={'MESH', 'ARMATURE', 'MORPHS'}, log_level='WARNING')
+            mesh = [obj for obj in bpy.data.objects if obj.type == 'MESH' and obj not in meshes][0]
+
+        def blender_co(co):
+            return (co[0] * scale, co[2] * scale, co[1] * scale)
+
+        def assertShapeKey(name, expected):
+            for point, co in zip(mesh.data.shape_keys.key_blocks[name].data, expected):
+                for a, b in zip(point.co, co):
+                    self.assertAlmostEqual(a, b, places=4)
+
+        basis = [blender_co(vertex.co) for vertex in model.vertices]
+        assertShapeKey(0, basis)
+
+        morph = model.morphs[0]
+        expected = [list(co) for co in basis]
+        for offset in morph.offsets:
+            for axis, value in enumerate(blender_co(offset.offset)):
+                expected[offset.index][axis] += value
+        assertShapeKey(morph.name, expected)
+
+        # Only SDEF vertices are moved in the SDEF shape keys, with the lower bone index first
+        for name, attribute in [('mmd_sdef_c', 'c'), ('mmd_sdef_r0', 'r0'), ('mmd_sdef_r1', 'r1')]:
+            expected = list(basis)
+            for i, vertex in enumerate(model.vertices):
+                weight = vertex.weight
+                if weight.type == pmx.BoneWeight.SDEF:
+                    vertex_attribute = attribute
+                    if weight.bones[0] > weight.bones[1] and attribute != 'c':
+                        vertex_attribute = {'r0': 'r1', 'r1': 'r0'}[attribute]
+                    expected[i] = blender_co(getattr(weight.weights, vertex_attribute))
+            assertShapeKey(name, expected)
+
+    def test_pmd_loader(self):
+        # A PMD file with two vertices and one face, all other sections are empty
+        data = b'Pmd' + struct.pack('<f', 1.0) + b'Model'.ljust(20, b'\0') + b'Comment'.ljust(256, b'\0')
+        data += struct.pack('<I', 2)
+        data += struct.pack('<8f2H2B', 1, 2, 3, 0, 1, 0, 0.25, 0.5, 0, 1, 100, 0)
+        data += struct.pack('<8f2H2B', 4, 5, 6, 1, 0, 0, 0.75, 1, 1, 0, 40, 1)
+        data += struct.pack('<I3H', 3, 0, 1, 1)
+        data += struct.pack('<IHHHBBI', 0, 0, 0, 0, 0, 0, 0)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'synthetic.pmd')
+            with open(path, 'wb') as f:
+                f.write(data)
+            model = pmd.load(path)
+
+        self.assertEqual(model.name, 'Model')
+        self.assertEqual(model.comment, 'Comment')
+        self.assertEqual([v.position for v in model.vertices], [(1, 2, 3), (4, 5, 6)])
+        self.assertEqual([v.uv for v in model.vertices], [(0.25, 0.5), (0.75, 1)])
+        self.assertEqual([v.bones for v in model.vertices], [[0, 1], [1, 0]])
+        self.assertEqual([(v.weight, v.enable_edge) for v in model.vertices], [(100, 0), (40, 1)])
+        self.assertEqual(model.faces, [(1, 1, 0)])
+
+
+suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestAddon)
+runner = unittest.TextTestRunner()
+ret = not runner.run(suite).wasSuccessful()
+sys.exit(ret)
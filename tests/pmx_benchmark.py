@@ -0,0 +1,168 @@
+# MIT License
+
+# Copyright (c) 2017 GiveMeAllYourCats
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Code author: GiveMeAllYourCats
+# Repo: https://github.com/michaeldegroot/cats-blender-plugin
+# Edits by: GiveMeAllYourCats
+
+# Offline memory benchmark for the PMX loader in extern_tools/mmd_tools_local/core/pmx
+# Runs with a plain Python interpreter, Blender is not needed:
+#   python tests/pmx_benchmark.py
+#   python tests/pmx_benchmark.py --vertices 50000 --morphs 20
+#   python tests/pmx_benchmark.py --module old_pmx.py    measures another version of core/pmx/__init__.py
+# Without numpy only the per-object representation gets measured.
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import tracemalloc
+import importlib.util
+
+from optparse import OptionParser
+
+main_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+pmx_file = os.path.join(main_dir, 'extern_tools', 'mmd_tools_local', 'core', 'pmx', '__init__.py')
+
+
+def load_pmx(path):
+    # core/pmx only needs the standard library (and numpy if it is installed)
+    spec = importlib.util.spec_from_file_location('pmx_benchmark_module', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Synthetic model
+#################
+
+def create_model(pmx, vertex_count, morph_count, seed=0):
+    rng = random.Random(seed)
+    model = pmx.Model()
+    model.name = 'Synthetic'
+
+    for i in range(100):
+        bone = pmx.Bone()
+        bone.name = 'Bone' + str(i)
+        bone.location = [0, i, 0]
+        bone.parent = i - 1
+        model.bones.append(bone)
+
+    for i in range(vertex_count):
+        vertex = pmx.Vertex()
+        vertex.co = [rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1)]
+        vertex.normal = [0.0, 1.0, 0.0]
+        vertex.uv = [rng.random(), rng.random()]
+
+        # Mostly BDEF2 and BDEF4 like real models
+        weight = vertex.weight = pmx.BoneWeight()
+        if i % 3:
+            weight.type = pmx.BoneWeight.BDEF2
+            weight.bones = [rng.randrange(100), rng.randrange(100)]
+            weight.weights = [rng.random()]
+        else:
+            weight.type = pmx.BoneWeight.BDEF4
+            weight.bones = [rng.randrange(100) for _ in range(4)]
+            weight.weights = [0.25, 0.25, 0.25, 0.25]
+        model.vertices.append(vertex)
+
+    model.faces = [(i, (i + 1) % vertex_count, (i + 2) % vertex_count) for i in range(vertex_count)]
+
+    material = pmx.Material()
+    material.name = 'Material'
+    material.diffuse = [1, 1, 1, 1]
+    material.specular = [0, 0, 0]
+    material.ambient = [0.5, 0.5, 0.5]
+    material.edge_color = [0, 0, 0, 1]
+    material.vertex_count = len(model.faces) * 3
+    model.materials.append(material)
+
+    # Every morph moves half of the vertices
+    for i in range(morph_count):
+        morph = pmx.VertexMorph('Morph' + str(i), 'Morph' + str(i), pmx.Morph.CATEGORY_OHTER)
+        for index in sorted(rng.sample(range(vertex_count), vertex_count // 2)):
+            offset = pmx.VertexMorphOffset()
+            offset.index = index
+            offset.offset = [rng.uniform(-0.1, 0.1), rng.uniform(-0.1, 0.1), rng.uniform(-0.1, 0.1)]
+            morph.offsets.append(offset)
+        model.morphs.append(morph)
+
+    return model
+
+
+# Benchmark
+###########
+
+def measure(pmx, path, use_numpy):
+    numpy = getattr(pmx, 'np', None)
+    if not use_numpy:
+        pmx.np = None
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        model = pmx.load(path)
+        duration = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        if hasattr(pmx, 'np'):
+            pmx.np = numpy
+
+    del model
+    return current, peak, duration
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('-v', '--vertices', dest='vertices', help='number of vertices', type='int', default=200000)
+    parser.add_option('-m', '--morphs', dest='morphs', help='number of vertex morphs, each moves half of the vertices', type='int', default=10)
+    parser.add_option('--module', dest='module', help='path of the core/pmx/__init__.py to measure', default=pmx_file)
+    (options, args) = parser.parse_args()
+
+    pmx = load_pmx(options.module)
+    modes = [('objects', False)]
+    if getattr(pmx, 'np', None) is not None:
+        modes.append(('arrays', True))
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, 'synthetic.pmx')
+        pmx.save(path, create_model(pmx, options.vertices, options.morphs))
+        print('%d vertices, %d vertex morphs, %d KB file' % (options.vertices, options.morphs, os.path.getsize(path) / 1024))
+
+        print('mode'.ljust(8), 'bytes/vertex'.rjust(14), 'peak bytes/vertex'.rjust(18), 'model MB'.rjust(10), 'load s'.rjust(8))
+        for name, use_numpy in modes:
+            current, peak, duration = measure(pmx, path, use_numpy)
+            print(name.ljust(8),
+                  str(round(current / options.vertices)).rjust(14),
+                  str(round(peak / options.vertices)).rjust(18),
+                  str(round(current / 1024 / 1024, 1)).rjust(10),
+                  str(round(duration, 2)).rjust(8))
+    finally:
+        shutil.rmtree(temp_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
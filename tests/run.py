@@ -83,7 +83,7 @@ verbosity = options.verbosity
 
 scripts = 0
 exit_code = 0
-scripts_only_executed_once = ['atlas.test.py', 'syntax.test.py']
+scripts_only_executed_once = ['atlas.test.py', 'syntax.test.py', 'translate_client.test.py', 'startup.test.py']
 scripts_executed = []
 
 
@@ -0,0 +1,79 @@
+# MIT License
+
+# Copyright (c) 2017 GiveMeAllYourCats
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Code author: GiveMeAllYourCats
+# Repo: https://github.com/michaeldegroot/cats-blender-plugin
+# Edits by: GiveMeAllYourCats
+
+import os
+import sys
+import time
+import unittest
+
+import cats
+from cats.tools import translate as Translate
+from cats.tools import translations as Translations
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def remove_file(path):
+    if os.path.isfile(path):
+        os.remove(path)
+
+
+class TestAddon(unittest.TestCase):
+    def test_register_time(self):
+        # Cold start, the translation tables have to be parsed from their source files
+        remove_file(Translate.dictionary_cache_file)
+        remove_file(Translations.translations_cache_file)
+
+        cats.unregister()
+        register_time = timed(cats.register)
+        names_cold = timed(Translate.load_translations)
+        ui_cold = timed(Translations.load_translations)
+        dictionary_cold = dict(Translate.dictionary)
+        ui_dictionary_cold = dict(Translations.dictionary)
+
+        # Warm start, the tables are read from the snapshots of the cold start
+        cats.unregister()
+        register_time_warm = timed(cats.register)
+        names_warm = timed(Translate.load_translations)
+        ui_warm = timed(Translations.load_translations)
+
+        print('register():                         {:.3f}s (warm {:.3f}s)'.format(register_time, register_time_warm))
+        print('register() with eager dictionaries: {:.3f}s (previous behaviour)'.format(register_time + names_cold))
+        print('name dictionary load:               {:.3f}s cold, {:.3f}s cached'.format(names_cold, names_warm))
+        print('UI translations load:               {:.3f}s cold, {:.3f}s cached'.format(ui_cold, ui_warm))
+
+        self.assertEqual(dict(Translate.dictionary), dictionary_cold)
+        self.assertEqual(dict(Translations.dictionary), ui_dictionary_cold)
+
+
+suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestAddon)
+runner = unittest.TextTestRunner()
+ret = not runner.run(suite).wasSuccessful()
+sys.exit(ret)
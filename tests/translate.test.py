@@ -34,6 +34,34 @@ class TestAddon(unittest.TestCase):
         result = bpy.ops.cats_translate.shapekeys()
         self.assertTrue(result == {'FINISHED'})
 
+    def test_dictionary_matcher(self):
+        from cats.tools import translate as Translate
+        Translate.ensure_translations_loaded()
+
+        # The matcher has to replace exactly like iterating over the length sorted dictionary
+        sorted_keys = sorted(Translate.dictionary.keys(), key=lambda k: Translate.dictionary_matcher.ranks[k])
+
+        def translate_linear(name):
+            length = len(name)
+            translated_count = 0
+            for key in sorted_keys:
+                value = Translate.dictionary[key]
+                if key in name and value:
+                    name = name.replace(key, value)
+                    translated_count += len(key)
+                    if translated_count >= length:
+                        break
+            return name
+
+        names = ['左足首', '右ひじ', '髪の毛先', '両目', 'まばたき', 'ω□', '全ての親', 'Bone.L']
+        for armature in bpy.data.armatures:
+            names += [bone.name for bone in armature.bones]
+
+        for name in names:
+            name = Translate.fix_jp_chars(name)
+            result, _ = Translate.dictionary_matcher.replace(name, Translate.dictionary, len(name))
+            self.assertEqual(result, translate_linear(name))
+
 
 suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestAddon)
 runner = unittest.TextTestRunner()
@@ -0,0 +1,254 @@
+# MIT License
+
+# Copyright (c) 2017 GiveMeAllYourCats
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Code author: GiveMeAllYourCats
+# Repo: https://github.com/michaeldegroot/cats-blender-plugin
+# Edits by: GiveMeAllYourCats
+
+# Offline throughput benchmark for tools/translate.py
+# Runs with a plain Python interpreter, Blender is not needed:
+#   python tests/translate_benchmark.py                    compares against the stored baseline
+#   python tests/translate_benchmark.py --update-baseline  stores the current results as the new baseline
+#   python tests/translate_benchmark.py --sizes 1000,10000
+
+import os
+import sys
+import json
+import time
+import types
+import random
+import shutil
+import tempfile
+import tracemalloc
+import contextlib
+import importlib.util
+
+from optparse import OptionParser
+
+main_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+tools_dir = os.path.join(main_dir, 'tools')
+baseline_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'translate_benchmark.json')
+
+
+# Stand-ins for everything tools/translate.py needs from Blender and the rest of CATS
+#####################################################################################
+
+def make_module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    module.__path__ = []
+    sys.modules[name] = module
+    return module
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class RequestException(Exception):
+    pass
+
+
+class FakeBackend:
+    # Answers instantly, every line gets a translation made of ASCII words
+    requests_per_second = 1000000.0
+
+    def translate(self, text, lang_src, lang_tgt):
+        return '\n'.join('word ' + str(len(line)) + ' ' + str(sum(map(ord, line)) % 997) for line in text.split('\n'))
+
+
+def load_translate():
+    scene = types.SimpleNamespace(use_google_only=False)
+    make_module('bpy',
+                types=types.SimpleNamespace(Operator=object),
+                context=types.SimpleNamespace(scene=scene),
+                app=types.SimpleNamespace(version=(4, 0, 0)))
+
+    make_module('requests', post=None)
+    make_module('requests.exceptions', ConnectionError=ConnectionError, RequestException=RequestException)
+    sys.modules['requests'].exceptions = sys.modules['requests.exceptions']
+
+    make_module('mmd_tools_local')
+    load_module('mmd_tools_local.translations', os.path.join(main_dir, 'extern_tools', 'mmd_tools_local', 'translations.py'))
+
+    make_module('cats', globs=types.SimpleNamespace(time_format="%Y-%m-%d %H:%M:%S", dict_found=False))
+    sys.modules['cats.globs'] = sys.modules['cats'].globs
+    make_module('cats.tools')
+    make_module('cats.tools.common', html_to_text=str)
+    make_module('cats.tools.register', register_wrap=lambda cls: cls)
+    make_module('cats.tools.translations', t=lambda phrase, *args, **kwargs: phrase)
+
+    load_module('cats.tools.translate_cache', os.path.join(tools_dir, 'translate_cache.py'))
+    load_module('cats.tools.translate_client', os.path.join(tools_dir, 'translate_client.py'))
+    return load_module('cats.tools.translate', os.path.join(tools_dir, 'translate.py'))
+
+
+def use_temp_resources(translate, temp_dir):
+    # The google dictionary and caches must not end up in the real resources folder
+    translate.dictionary_google_file = os.path.join(temp_dir, 'dictionary_google.json')
+    translate.dictionary_google_journal_file = os.path.join(temp_dir, 'dictionary_google.journal')
+    translate.dictionary_cache_file = os.path.join(temp_dir, 'dictionary_cache.pickle')
+    translate.google_journal = translate.TranslateCache.TranslationJournal(translate.dictionary_google_file, translate.dictionary_google_journal_file)
+    translate.translation_backend = FakeBackend()
+
+
+# Synthetic bone and shape key names
+####################################
+
+kana = [chr(c) for c in range(0x30a1, 0x30f6)] + [chr(c) for c in range(0x3041, 0x3094)]
+half_width = ['ｶﾞ', 'ﾊﾟ', 'ｱ', 'ｲ', 'ｳ', 'ｼ', 'ﾝ']
+ascii_parts = ['Bone', 'Arm', 'Leg', 'Hair', '_L', '_R', '.L', '.R', '.001', 'J_Sec', 'Skirt']
+
+
+def generate_names(count, dictionary_keys, seed=0):
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            choice = rng.random()
+            if choice < 0.45:
+                parts.append(rng.choice(dictionary_keys))
+            elif choice < 0.65:
+                parts.append(''.join(rng.choice(kana) for _ in range(rng.randint(1, 4))))
+            elif choice < 0.75:
+                parts.append(rng.choice(half_width))
+            else:
+                parts.append(rng.choice(ascii_parts))
+        if rng.random() < 0.2:
+            parts.append(str(i))
+        names.append(''.join(parts))
+    return names
+
+
+# Benchmark
+###########
+
+def measure(function, names):
+    start = time.perf_counter()
+    function(names)
+    duration = time.perf_counter() - start
+    return len(names) / duration if duration else float('inf')
+
+
+@contextlib.contextmanager
+def quiet():
+    # update_dictionary() prints every new translation
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def reset_dictionaries(translate, temp_dir):
+    # Every run starts with an empty google dictionary
+    for file in os.listdir(temp_dir):
+        os.remove(os.path.join(temp_dir, file))
+    with quiet():
+        translate.reset_google_dict()
+        translate.load_translations()
+    translate.fix_jp_chars_cached.cache_clear()
+
+
+def run_size(translate, size, temp_dir):
+    reset_dictionaries(translate, temp_dir)
+    names = generate_names(size, list(translate.dictionary.keys()), seed=size)
+
+    results = {}
+    results['fix_jp_chars'] = measure(lambda names: [translate.fix_jp_chars(name) for name in names], names)
+    with quiet():
+        results['update_dictionary'] = measure(translate.update_dictionary, names)
+    results['translate'] = measure(lambda names: [translate.translate(name) for name in names], names)
+
+    # Peak memory of the same run, measured separately since tracemalloc slows everything down
+    reset_dictionaries(translate, temp_dir)
+    tracemalloc.start()
+    with quiet():
+        translate.update_dictionary(names)
+    translations = [translate.translate(name) for name in names]
+    results['peak_memory_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    del translations
+
+    return results
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('-s', '--sizes', dest='sizes', help='comma separated numbers of names', default='1000,10000,100000')
+    parser.add_option('-u', '--update-baseline', dest='update_baseline', action='store_true', help='store the results as the new baseline', default=False)
+    parser.add_option('-t', '--tolerance', dest='tolerance', help='allowed throughput loss compared to the baseline', type='float', default=0.5)
+    (options, args) = parser.parse_args()
+
+    translate = load_translate()
+    temp_dir = tempfile.mkdtemp()
+    use_temp_resources(translate, temp_dir)
+
+    results = {}
+    try:
+        for size in [int(size) for size in options.sizes.split(',')]:
+            results[str(size)] = run_size(translate, size, temp_dir)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print('names'.rjust(8), 'fix_jp_chars/s'.rjust(16), 'update_dictionary/s'.rjust(20), 'translate/s'.rjust(14), 'peak KB'.rjust(10))
+    for size, result in results.items():
+        print(size.rjust(8),
+              str(round(result['fix_jp_chars'])).rjust(16),
+              str(round(result['update_dictionary'])).rjust(20),
+              str(round(result['translate'])).rjust(14),
+              str(round(result['peak_memory_kb'])).rjust(10))
+
+    if options.update_baseline:
+        with open(baseline_file, 'w', encoding='utf8') as file:
+            json.dump({size: {key: round(value) for key, value in result.items()} for size, result in results.items()}, file, indent=4)
+        print('Baseline updated')
+        return 0
+
+    try:
+        with open(baseline_file, encoding='utf8') as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print('No baseline found, run with --update-baseline first')
+        return 0
+
+    regressions = []
+    for size, result in results.items():
+        for key in ['fix_jp_chars', 'update_dictionary', 'translate']:
+            expected = baseline.get(size, {}).get(key)
+            if expected and result[key] < expected * (1 - options.tolerance):
+                regressions.append(key + ' with ' + size + ' names: ' + str(round(result[key])) + '/s, baseline ' + str(round(expected)) + '/s')
+
+    if regressions:
+        print('Throughput regressed:')
+        for regression in regressions:
+            print(' - ' + regression)
+        return 1
+
+    print('No regressions')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# MIT License
+
+# Copyright (c) 2017 GiveMeAllYourCats
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Code author: GiveMeAllYourCats
+# Repo: https://github.com/michaeldegroot/cats-blender-plugin
+# Edits by: GiveMeAllYourCats
+
+import sys
+import json
+import unittest
+import threading
+
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+# Answers like the Google batchexecute endpoint, every line gets translated to 'EN <line>'
+class FakeGoogleHandler(BaseHTTPRequestHandler):
+    requests_received = 0
+    failing_requests = 0
+
+    def do_POST(self):
+        FakeGoogleHandler.requests_received += 1
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+        rpc = json.loads(parse_qs(body)['f.req'][0])
+        text = json.loads(rpc[0][0][1])[0][0]
+
+        self.send_response(200)
+        self.end_headers()
+
+        # A response without translation, this chunk has to be retried
+        if FakeGoogleHandler.failing_requests:
+            FakeGoogleHandler.failing_requests -= 1
+            self.wfile.write(b")]}'\n")
+            return
+
+        lines = text.split('\n')
+        sentences = [['EN ' + line + ('\n' if i < len(lines) - 1 else ''), None] for i, line in enumerate(lines)]
+        inner = json.dumps([[None, None, 'ja'], [[[None, None, None, None, None, sentences]], 'en']])
+        line = json.dumps([['wrb.fr', 'MkEWBc', inner, None, None, None, 'generic']])[:-1]
+        self.wfile.write((")]}'\n\n123\n" + line + '\n').encode('utf-8'))
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAddon(unittest.TestCase):
+    def setUp(self):
+        from cats.tools import translate_client as TranslateClient
+        self.client = TranslateClient
+
+        FakeGoogleHandler.requests_received = 0
+        FakeGoogleHandler.failing_requests = 0
+        self.server = HTTPServer(('127.0.0.1', 0), FakeGoogleHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.backend = TranslateClient.GoogleBackend(url='http://127.0.0.1:' + str(self.server.server_port) + '/')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_batch_translation(self):
+        names = ['名前' + str(i) for i in range(300)]
+        translator = self.client.BatchTranslator(backend=self.backend, rate_limiter=self.client.TokenBucket(rate=100, capacity=100))
+        translations = translator.translate(names)
+
+        self.assertEqual(translations, ['EN ' + name for name in names])
+        self.assertLessEqual(FakeGoogleHandler.requests_received, 10)
+
+    def test_chunk_retry(self):
+        names = ['名前' + str(i) for i in range(10)]
+        FakeGoogleHandler.failing_requests = 1
+        translator = self.client.BatchTranslator(backend=self.backend, workers=1)
+        translations = translator.translate(names)
+
+        self.assertEqual(translations, ['EN ' + name for name in names])
+        self.assertEqual(FakeGoogleHandler.requests_received, 2)
+
+    def test_retry_limit(self):
+        FakeGoogleHandler.failing_requests = 3
+        translator = self.client.BatchTranslator(backend=self.backend, workers=1, retries=3)
+        with self.assertRaises(self.client.TranslationError):
+            translator.translate(['名前'])
+        self.assertEqual(FakeGoogleHandler.requests_received, 3)
+
+
+suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestAddon)
+runner = unittest.TextTestRunner()
+ret = not runner.run(suite).wasSuccessful()
+sys.exit(ret)
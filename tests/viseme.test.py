@@ -40,6 +40,41 @@ class TestAddon(unittest.TestCase):
         result = bpy.ops.cats_viseme.create()
         self.assertTrue(result == {'FINISHED'})
 
+    def test_sort_shape_keys(self):
+        from cats.tools import common as Common
+
+        bpy.ops.cats_armature.fix()
+        meshes = [mesh for mesh in Common.get_meshes_objects() if Common.has_shapekeys(mesh)]
+        if not meshes:
+            return
+        mesh = meshes[0]
+
+        # Sort the custom keys in reverse and check that only the order changed
+        key_blocks = mesh.data.shape_keys.key_blocks
+        names = [shapekey.name for shapekey in key_blocks]
+        relative_keys = {shapekey.name: shapekey.relative_key.name for shapekey in key_blocks}
+        custom_names = [name for name in names[1:] if not name.startswith('vrc.') and name != 'Basis Original'][::-1]
+
+        Common.sort_shape_keys(mesh.name, custom_names)
+        sorted_names = [shapekey.name for shapekey in key_blocks]
+        self.assertEqual(sorted(sorted_names), sorted(names))
+        self.assertEqual([name for name in sorted_names if name in custom_names], custom_names)
+        self.assertEqual({shapekey.name: shapekey.relative_key.name for shapekey in key_blocks}, relative_keys)
+
+        # Move the vrc keys behind all other keys, sorting has to move them back to the top below the Basis
+        sorted_names = [shapekey.name for shapekey in key_blocks]
+        vrc_names = [name for name in sorted_names if name.startswith('vrc.')]
+        if not vrc_names or len(vrc_names) == len(sorted_names) - 1:
+            return
+        for name in reversed(vrc_names):
+            mesh.active_shape_key_index = key_blocks.find(name)
+            bpy.ops.object.shape_key_move(type='BOTTOM')
+        self.assertNotEqual([shapekey.name for shapekey in key_blocks], sorted_names)
+
+        Common.sort_shape_keys(mesh.name, custom_names)
+        self.assertEqual([shapekey.name for shapekey in key_blocks], sorted_names)
+        self.assertEqual({shapekey.name: shapekey.relative_key.name for shapekey in key_blocks}, relative_keys)
+
 
 suite = unittest.defaultTestLoader.loadTestsFromTestCase(TestAddon)
 runner = unittest.TextTestRunner()
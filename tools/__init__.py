@@ -21,6 +21,8 @@ if "bpy" not in locals():
     from . import settings
     from . import shapekey
     from . import supporter
+    from . import translate_cache
+    from . import translate_client
     from . import translate
     from . import translations
     from . import viseme
@@ -47,6 +49,8 @@ else:
     importlib.reload(settings)
     importlib.reload(shapekey)
     importlib.reload(supporter)
+    importlib.reload(translate_cache)
+    importlib.reload(translate_client)
     importlib.reload(translate)
     importlib.reload(translations)
     importlib.reload(viseme)
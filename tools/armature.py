@@ -316,6 +316,7 @@ class FixArmature(bpy.types.Operator):
             for mesh in Common.get_meshes_objects(mode=2):
                 if mesh.name.endswith(('.baked', '.baked0')):
                     mesh.parent = armature  # TODO
+                    Common.invalidate_meshes_index()
 
         # Check if weird FBX model
         print('CHECK TRANSFORMS:', armature.scale[0], armature.scale[1], armature.scale[2])
@@ -939,192 +940,194 @@ class FixArmature(bpy.types.Operator):
                 if mod.type == 'ARMATURE':
                     bpy.ops.object.modifier_remove(modifier=mod.name)
 
-            # Fix MMD twist bones
-            print('FIX TWIST BONES')
-            print(bones_to_delete)
-            Common.fix_twist_bones(mesh, bones_to_delete)
-            print(bones_to_delete)
-
-            # Add bones to parent reweight list
-            for name in Bones.bone_reweigth_to_parent:
-                if '\Left' in name or '\L' in name:
-                    bones = [name.replace('\Left', 'Left').replace('\left', 'left').replace('\L', 'L').replace('\l', 'l'),
-                             name.replace('\Left', 'Right').replace('\left', 'right').replace('\L', 'R').replace('\l', 'r')]
-                else:
-                    bones = [name]
+            # Collect all weight mixes of this mesh and write the vertex groups back once
+            with Common.weight_transfer(mesh):
+                # Fix MMD twist bones
+                print('FIX TWIST BONES')
+                print(bones_to_delete)
+                Common.fix_twist_bones(mesh, bones_to_delete)
+                print(bones_to_delete)
+
+                # Add bones to parent reweight list
+                for name in Bones.bone_reweigth_to_parent:
+                    if '\Left' in name or '\L' in name:
+                        bones = [name.replace('\Left', 'Left').replace('\left', 'left').replace('\L', 'L').replace('\l', 'l'),
+                                 name.replace('\Left', 'Right').replace('\left', 'right').replace('\L', 'R').replace('\l', 'r')]
+                    else:
+                        bones = [name]
 
-                for bone_name in bones:
-                    bone_child = None
-                    bone_parent = None
-                    for bone in armature.data.bones:
-                        if bone_name.lower() == bone.name.lower():
-                            bone_child = bone
-                            bone_parent = bone.parent
+                    for bone_name in bones:
+                        bone_child = None
+                        bone_parent = None
+                        for bone in armature.data.bones:
+                            if bone_name.lower() == bone.name.lower():
+                                bone_child = bone
+                                bone_parent = bone.parent
 
-                    if not bone_child or not bone_parent:
-                        continue
-
-                    if context.scene.keep_twist_bones and 'twist' in bone_child.name.lower():
-                        continue
-                    if context.scene.fix_twist_bones and bone_child.name.lower() in ['handtwist_l', 'handtwist_r', 'armtwist_l', 'armtwist_r']:
-                        print('TWIST FOUND!')
-                        continue
+                        if not bone_child or not bone_parent:
+                            continue
 
-                    # search for next parent that is not in the "reweight to parent" list
-                    parent_in_list = True
-                    while parent_in_list:
-                        parent_in_list = False
-                        for name_tmp in Bones.bone_reweigth_to_parent:
-                            if bone_parent.name == name_tmp.replace('\Left', 'Left').replace('\left', 'left').replace('\L', 'L').replace('\l', 'l') \
-                                    or bone_parent.name == name_tmp.replace('\Left', 'Right').replace('\left', 'right').replace('\L', 'R').replace('\l', 'r'):
-                                bone_parent = bone_parent.parent
-                                parent_in_list = True
-                                break
+                        if context.scene.keep_twist_bones and 'twist' in bone_child.name.lower():
+                            continue
+                        if context.scene.fix_twist_bones and bone_child.name.lower() in ['handtwist_l', 'handtwist_r', 'armtwist_l', 'armtwist_r']:
+                            print('TWIST FOUND!')
+                            continue
 
-                    if not bone_parent:
-                        continue
+                        # search for next parent that is not in the "reweight to parent" list
+                        parent_in_list = True
+                        while parent_in_list:
+                            parent_in_list = False
+                            for name_tmp in Bones.bone_reweigth_to_parent:
+                                if bone_parent.name == name_tmp.replace('\Left', 'Left').replace('\left', 'left').replace('\L', 'L').replace('\l', 'l') \
+                                        or bone_parent.name == name_tmp.replace('\Left', 'Right').replace('\left', 'right').replace('\L', 'R').replace('\l', 'r'):
+                                    bone_parent = bone_parent.parent
+                                    parent_in_list = True
+                                    break
+
+                        if not bone_parent:
+                            continue
 
-                    if bone_child.name not in mesh.vertex_groups:
-                        # Add bone to delete list
-                        if bone_child.name not in bones_to_delete:
-                            bones_to_delete.append(bone_child.name)
-                        continue
+                        if bone_child.name not in mesh.vertex_groups:
+                            # Add bone to delete list
+                            if bone_child.name not in bones_to_delete:
+                                bones_to_delete.append(bone_child.name)
+                            continue
 
-                    if bone_parent.name not in mesh.vertex_groups:
-                        mesh.vertex_groups.new(name=bone_parent.name)
+                        if bone_parent.name not in mesh.vertex_groups:
+                            mesh.vertex_groups.new(name=bone_parent.name)
 
-                    bone_tmp = armature.data.bones.get(bone_child.name)
-                    if bone_tmp:
-                        for child in bone_tmp.children:
-                            if not temp_list_reparent_bones.get(child.name):
-                                temp_list_reparent_bones[child.name] = bone_parent.name
+                        bone_tmp = armature.data.bones.get(bone_child.name)
+                        if bone_tmp:
+                            for child in bone_tmp.children:
+                                if not temp_list_reparent_bones.get(child.name):
+                                    temp_list_reparent_bones[child.name] = bone_parent.name
 
-                    # Mix the weights
-                    Common.mix_weights(mesh, bone_child.name, bone_parent.name)
+                        # Mix the weights
+                        Common.mix_weights(mesh, bone_child.name, bone_parent.name)
 
-                    # Add bone to delete list
-                    if bone_child.name not in bones_to_delete:
-                        bones_to_delete.append(bone_child.name)
+                        # Add bone to delete list
+                        if bone_child.name not in bones_to_delete:
+                            bones_to_delete.append(bone_child.name)
 
-            # Merge weights
-            for bone_new, bones_old in temp_reweight_bones.items():
-                if '\Left' in bone_new or '\L' in bone_new:
-                    bones = [[bone_new.replace('\Left', 'Left').replace('\left', 'left').replace('\L', 'L').replace('\l', 'l'), ''],
-                             [bone_new.replace('\Left', 'Right').replace('\left', 'right').replace('\L', 'R').replace('\l', 'r'), '']]
-                else:
-                    bones = [[bone_new, '']]
-                for bone_old in bones_old:
+                # Merge weights
+                for bone_new, bones_old in temp_reweight_bones.items():
                     if '\Left' in bone_new or '\L' in bone_new:
-                        bones[0][1] = bone_old.replace('\Left', 'Left').replace('\left', 'left').replace('\L', 'L').replace('\l', 'l')
-                        bones[1][1] = bone_old.replace('\Left', 'Right').replace('\left', 'right').replace('\L', 'R').replace('\l', 'r')
+                        bones = [[bone_new.replace('\Left', 'Left').replace('\left', 'left').replace('\L', 'L').replace('\l', 'l'), ''],
+                                 [bone_new.replace('\Left', 'Right').replace('\left', 'right').replace('\L', 'R').replace('\l', 'r'), '']]
                     else:
-                        bones[0][1] = bone_old
+                        bones = [[bone_new, '']]
+                    for bone_old in bones_old:
+                        if '\Left' in bone_new or '\L' in bone_new:
+                            bones[0][1] = bone_old.replace('\Left', 'Left').replace('\left', 'left').replace('\L', 'L').replace('\l', 'l')
+                            bones[1][1] = bone_old.replace('\Left', 'Right').replace('\left', 'right').replace('\L', 'R').replace('\l', 'r')
+                        else:
+                            bones[0][1] = bone_old
+
+                        for bone in bones:  # bone[0] = new name, bone[1] = old name
+                            current_step += 1
+                            wm.progress_update(current_step)
+
+                            # Seach for vertex group
+                            vg = None
+                            for vg_tmp in mesh.vertex_groups:
+                                if vg_tmp.name.lower() == bone[1].lower():
+                                    vg = vg_tmp
+                                    break
+
+                            # Cancel if vertex group was not found
+                            if not vg:
+                                # Add bone to delete list
+                                if bone[1] not in bones_to_delete:
+                                    bones_to_delete.append(bone[1])
+                                continue
 
-                    for bone in bones:  # bone[0] = new name, bone[1] = old name
-                        current_step += 1
-                        wm.progress_update(current_step)
+                            if bone[0] == vg.name:
+                                print('BUG: ' + bone[0] + ' tried to mix weights with itself!')
+                                continue
 
-                        # Seach for vertex group
-                        vg = None
-                        for vg_tmp in mesh.vertex_groups:
-                            if vg_tmp.name.lower() == bone[1].lower():
-                                vg = vg_tmp
-                                break
+                            if context.scene.keep_twist_bones and 'twist' in bone[1].lower():
+                                continue
+                            if context.scene.fix_twist_bones and bone[1].lower() in ['handtwist_l', 'handtwist_r', 'armtwist_l', 'armtwist_r']:
+                                print('TWIST FOUND!')
+                                continue
 
-                        # Cancel if vertex group was not found
-                        if not vg:
-                            # Add bone to delete list
-                            if bone[1] not in bones_to_delete:
-                                bones_to_delete.append(bone[1])
-                            continue
+                            # print(bone[1] + " to1 " + bone[0])
 
-                        if bone[0] == vg.name:
-                            print('BUG: ' + bone[0] + ' tried to mix weights with itself!')
-                            continue
+                            # If important vertex group is not there create it
+                            if mesh.vertex_groups.get(bone[0]) is None:
+                                if bone[0] in Bones.dont_delete_these_bones and bone[0] in armature.data.bones:
+                                    bpy.ops.object.vertex_group_add()
+                                    mesh.vertex_groups.active.name = bone[0]
+                                    if mesh.vertex_groups.get(bone[0]) is None:
+                                        continue
+                                else:
+                                    continue
 
-                        if context.scene.keep_twist_bones and 'twist' in bone[1].lower():
-                            continue
-                        if context.scene.fix_twist_bones and bone[1].lower() in ['handtwist_l', 'handtwist_r', 'armtwist_l', 'armtwist_r']:
-                            print('TWIST FOUND!')
-                            continue
+                            bone_tmp = armature.data.bones.get(vg.name)
+                            if bone_tmp:
+                                for child in bone_tmp.children:
+                                    if not temp_list_reparent_bones.get(child.name):
+                                        temp_list_reparent_bones[child.name] = bone[0]
 
-                        # print(bone[1] + " to1 " + bone[0])
+                            # print(vg.name + " to " + bone[0])
+                            Common.mix_weights(mesh, vg.name, bone[0])
 
-                        # If important vertex group is not there create it
-                        if mesh.vertex_groups.get(bone[0]) is None:
-                            if bone[0] in Bones.dont_delete_these_bones and bone[0] in armature.data.bones:
-                                bpy.ops.object.vertex_group_add()
-                                mesh.vertex_groups.active.name = bone[0]
-                                if mesh.vertex_groups.get(bone[0]) is None:
-                                    continue
-                            else:
-                                continue
+                            # Add bone to delete list
+                            if vg.name not in bones_to_delete:
+                                bones_to_delete.append(vg.name)
 
-                        bone_tmp = armature.data.bones.get(vg.name)
-                        if bone_tmp:
-                            for child in bone_tmp.children:
-                                if not temp_list_reparent_bones.get(child.name):
-                                    temp_list_reparent_bones[child.name] = bone[0]
+                # Old mixing weights. Still important
+                for key, value in temp_list_reweight_bones.items():
+                    current_step += 1
+                    wm.progress_update(current_step)
 
-                        # print(vg.name + " to " + bone[0])
-                        Common.mix_weights(mesh, vg.name, bone[0])
+                    # Search for vertex groups
+                    vg_from = None
+                    vg_to = None
+                    for vg_tmp in mesh.vertex_groups:
+                        if vg_tmp.name.lower() == key.lower():
+                            vg_from = vg_tmp
+                            if vg_to:
+                                break
+                        elif vg_tmp.name.lower() == value.lower():
+                            vg_to = vg_tmp
+                            if vg_from:
+                                break
 
+                    # Cancel if vertex groups was not found
+                    if not vg_from:
                         # Add bone to delete list
-                        if vg.name not in bones_to_delete:
-                            bones_to_delete.append(vg.name)
-
-            # Old mixing weights. Still important
-            for key, value in temp_list_reweight_bones.items():
-                current_step += 1
-                wm.progress_update(current_step)
-
-                # Search for vertex groups
-                vg_from = None
-                vg_to = None
-                for vg_tmp in mesh.vertex_groups:
-                    if vg_tmp.name.lower() == key.lower():
-                        vg_from = vg_tmp
-                        if vg_to:
-                            break
-                    elif vg_tmp.name.lower() == value.lower():
-                        vg_to = vg_tmp
-                        if vg_from:
-                            break
-
-                # Cancel if vertex groups was not found
-                if not vg_from:
-                    # Add bone to delete list
-                    if key not in bones_to_delete:
-                        bones_to_delete.append(key)
-                    continue
+                        if key not in bones_to_delete:
+                            bones_to_delete.append(key)
+                        continue
 
-                # Cancel if vertex groups was not found
-                if not vg_to:
-                    continue
+                    # Cancel if vertex groups was not found
+                    if not vg_to:
+                        continue
 
-                if context.scene.keep_twist_bones and 'twist' in vg_from.name.lower():
-                    continue
-                if context.scene.fix_twist_bones and vg_from.name.lower() in ['handtwist_l', 'handtwist_r', 'armtwist_l', 'armtwist_r']:
-                    print('TWIST FOUND!')
-                    continue
+                    if context.scene.keep_twist_bones and 'twist' in vg_from.name.lower():
+                        continue
+                    if context.scene.fix_twist_bones and vg_from.name.lower() in ['handtwist_l', 'handtwist_r', 'armtwist_l', 'armtwist_r']:
+                        print('TWIST FOUND!')
+                        continue
 
-                bone_tmp = armature.data.bones.get(vg_from.name)
-                if bone_tmp:
-                    for child in bone_tmp.children:
-                        if not temp_list_reparent_bones.get(child.name):
-                            temp_list_reparent_bones[child.name] = vg_to.name
+                    bone_tmp = armature.data.bones.get(vg_from.name)
+                    if bone_tmp:
+                        for child in bone_tmp.children:
+                            if not temp_list_reparent_bones.get(child.name):
+                                temp_list_reparent_bones[child.name] = vg_to.name
 
-                if vg_from.name == vg_to.name:
-                    print('BUG: ' + vg_to.name + ' tried to mix weights with itself!')
-                    continue
+                    if vg_from.name == vg_to.name:
+                        print('BUG: ' + vg_to.name + ' tried to mix weights with itself!')
+                        continue
 
-                # Mix the weights
-                # print(vg_from.name, 'into', vg_to.name)
-                Common.mix_weights(mesh, vg_from.name, vg_to.name)
+                    # Mix the weights
+                    # print(vg_from.name, 'into', vg_to.name)
+                    Common.mix_weights(mesh, vg_from.name, vg_to.name)
 
-                # Add bone to delete list
-                if vg_from.name not in bones_to_delete:
-                    bones_to_delete.append(vg_from.name)
+                    # Add bone to delete list
+                    if vg_from.name not in bones_to_delete:
+                        bones_to_delete.append(vg_from.name)
 
             # Put back armature modifier
             mod = mesh.modifiers.new("Armature", 'ARMATURE')
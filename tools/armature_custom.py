@@ -136,6 +136,7 @@ class AttachMesh(bpy.types.Operator):
         # Reparent mesh to target armature
         mesh.parent = armature
         mesh.parent_type = 'OBJECT'
+        Common.invalidate_meshes_index()
 
         # Applies transforms of the armature and new mesh
         Common.apply_transforms(armature_name=base_armature_name)
@@ -344,6 +345,7 @@ def merge_armatures(base_armature_name, merge_armature_name, mesh_only, mesh_nam
         for mesh in meshes_merged:
             mesh.parent = base_armature
             Common.repair_mesh(mesh, base_armature_name)
+        Common.invalidate_meshes_index()
     if len(meshes_merged) == 1 and not meshes_merged[0]:
         meshes_merged = []
 
@@ -392,23 +394,25 @@ def merge_armatures(base_armature_name, merge_armature_name, mesh_only, mesh_nam
 
     # Merge bones into existing bones
     if not mesh_only:
-        to_delete = []
-        for bone_name in bones_to_merge:
-            bone_base = bone_name
-            bone_merge = bone_name + '.merge'
+        to_delete = [bone_name + '.merge' for bone_name in bones_to_merge]
+
+        # Mix all bones of one mesh at once, so every vertex group only gets written back once
+        for mesh_merged in meshes_merged:
+            Common.set_active(mesh_merged)
+            with Common.weight_transfer(mesh_merged):
+                for bone_name in bones_to_merge:
+                    bone_base = bone_name
+                    bone_merge = bone_name + '.merge'
 
-            for mesh_merged in meshes_merged:
-                Common.set_active(mesh_merged)
-                vg_base = mesh_merged.vertex_groups.get(bone_base)
-                vg_merge = mesh_merged.vertex_groups.get(bone_merge)
+                    vg_base = mesh_merged.vertex_groups.get(bone_base)
+                    vg_merge = mesh_merged.vertex_groups.get(bone_merge)
 
-                if not vg_base:
-                    mesh_merged.vertex_groups.new(name=bone_base)
-                if not vg_merge:
-                    mesh_merged.vertex_groups.new(name=bone_merge)
+                    if not vg_base:
+                        mesh_merged.vertex_groups.new(name=bone_base)
+                    if not vg_merge:
+                        mesh_merged.vertex_groups.new(name=bone_merge)
 
-                Common.mix_weights(mesh_merged, bone_merge, bone_base)
-            to_delete.append(bone_merge)
+                    Common.mix_weights(mesh_merged, bone_merge, bone_base)
 
         Common.set_active(armature)
         Common.switch('EDIT')
@@ -716,12 +716,13 @@ def merge_weights(armature, parenting_list):
     for mesh in Common.get_meshes_objects(armature_name=armature.name, visible_only=bpy.context.scene.merge_visible_meshes_only):
         Common.set_active(mesh)
 
-        for bone, parent in parenting_list.items():
-            if not mesh.vertex_groups.get(bone):
-                continue
-            if not mesh.vertex_groups.get(parent):
-                mesh.vertex_groups.new(name=parent)
-            Common.mix_weights(mesh, bone, parent)
+        with Common.weight_transfer(mesh):
+            for bone, parent in parenting_list.items():
+                if not mesh.vertex_groups.get(bone):
+                    continue
+                if not mesh.vertex_groups.get(parent):
+                    mesh.vertex_groups.new(name=parent)
+                Common.mix_weights(mesh, bone, parent)
 
     # Select armature
     Common.unselect_all()
@@ -1380,9 +1381,10 @@ class DuplicateBonesButton(bpy.types.Operator):
         for mesh in Common.get_meshes_objects(armature_name=armature.name):
             Common.set_active(mesh)
 
-            for bone_from, bone_to in duplicate_vertex_groups.items():
-                mesh.vertex_groups.new(name=bone_to)
-                Common.mix_weights(mesh, bone_from, bone_to, delete_old_vg=False)
+            with Common.weight_transfer(mesh):
+                for bone_from, bone_to in duplicate_vertex_groups.items():
+                    mesh.vertex_groups.new(name=bone_to)
+                    Common.mix_weights(mesh, bone_from, bone_to, delete_old_vg=False)
 
         saved_data.load()
 
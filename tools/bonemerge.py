@@ -73,23 +73,24 @@ class BoneMergeButton(bpy.types.Operator):
         wm = bpy.context.window_manager
         wm.progress_begin(did, todo)
 
-        # Start the bone check for every parent
-        for bone_name in parent_bones:
-            print('\nPARENT: ' + bone_name)
-            bone = armature.data.bones.get(bone_name)
-            if not bone:
-                continue
-
-            children = []
-            for child in bone.children:
-                children.append(child.name)
-
-            for child_name in children:
-                child = armature.data.bones.get(child_name)
-                print('CHILD: ' + child.name)
-                self.check_bone(mesh, child, ratio, ratio)
-                did += 1
-                wm.progress_update(did)
+        # Start the bone check for every parent, the weights of all merged bones get written back at the end
+        with Common.weight_transfer(mesh):
+            for bone_name in parent_bones:
+                print('\nPARENT: ' + bone_name)
+                bone = armature.data.bones.get(bone_name)
+                if not bone:
+                    continue
+
+                children = []
+                for child in bone.children:
+                    children.append(child.name)
+
+                for child_name in children:
+                    child = armature.data.bones.get(child_name)
+                    print('CHILD: ' + child.name)
+                    self.check_bone(mesh, child, ratio, ratio)
+                    did += 1
+                    wm.progress_update(did)
 
         saved_data.load()
 
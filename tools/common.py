@@ -27,11 +27,13 @@
 import re
 import bpy
 import time
-import bmesh
+import contextlib
 import platform
+import numpy as np
 
 from math import degrees
 from mathutils import Vector
+from bpy.app.handlers import persistent
 from datetime import datetime
 from html.parser import HTMLParser
 from html.entities import name2codepoint
@@ -102,7 +104,6 @@ class SavedData:
 
             mode, selected, hidden, pose = values
             # print(obj_name, mode, selected, hidden)
-            print(obj_name, pose)
 
             if load_mode and obj.mode != mode:
                 set_active(obj, skip_sel=True)
@@ -121,6 +122,17 @@ class SavedData:
                 set_active(get_objects().get(self.__active_object), skip_sel=True)
 
 
+@contextlib.contextmanager
+def saved_stage(**load_args):
+    # Saves the mode, selection, visibility and active object of every object and restores them once the block is left.
+    # Only the objects whose state actually changed get touched when restoring
+    saved_data = SavedData()
+    try:
+        yield saved_data
+    finally:
+        saved_data.load(**load_args)
+
+
 def get_armature(armature_name=None):
     if not armature_name:
         armature_name = bpy.context.scene.armature
@@ -147,14 +159,18 @@ def get_top_parent(child):
 
 def unhide_all_unnecessary():
     # TODO: Documentation? What does "unnecessary" mean?
-    try:
-        bpy.ops.object.hide_view_clear()
-    except RuntimeError:
-        pass
+    # The operator is only needed if there is something left to unhide
+    if any(obj.hide_get() for obj in get_objects()):
+        try:
+            bpy.ops.object.hide_view_clear()
+        except RuntimeError:
+            pass
 
     for collection in bpy.data.collections:
-        collection.hide_select = False
-        collection.hide_viewport = False
+        if collection.hide_select:
+            collection.hide_select = False
+        if collection.hide_viewport:
+            collection.hide_viewport = False
 
 
 def unhide_all():
@@ -190,7 +206,8 @@ def unselect_all():
 def set_active(obj, skip_sel=False):
     if not skip_sel:
         select(obj)
-    bpy.context.view_layer.objects.active = obj
+    if bpy.context.view_layer.objects.active != obj:
+        bpy.context.view_layer.objects.active = obj
 
 
 def get_active():
@@ -198,9 +215,11 @@ def get_active():
 
 
 def select(obj, sel=True):
+    # Selection and visibility changes are only written if they change something, every write tags the depsgraph
     if sel:
         hide(obj, False)
-    obj.select_set(sel)
+    if obj.select_get() != sel:
+        obj.select_set(sel)
 
 
 def is_selected(obj):
@@ -210,7 +229,8 @@ def is_selected(obj):
 def hide(obj, val=True):
     if hasattr(obj, 'hide'):
         obj.hide = val
-    obj.hide_set(val)
+    if obj.hide_get() != val:
+        obj.hide_set(val)
 
 
 def is_hidden(obj):
@@ -218,7 +238,8 @@ def is_hidden(obj):
 
 
 def set_unselectable(obj, val=True):
-    obj.hide_select = val
+    if obj.hide_select != val:
+        obj.hide_select = val
 
 
 def switch(new_mode, check_mode=True):
@@ -247,11 +268,9 @@ def set_default_stage():
 
     # Remove rigidbody collections, as they cause issues if they are not in the view_layer
     if bpy.context.scene.remove_rigidbodies_joints:
-        print('Collections:')
         for collection in bpy.data.collections:
-            print(' ' + collection.name, collection.name.lower())
             if 'rigidbody' in collection.name.lower():
-                print('DELETE')
+                print('DELETE COLLECTION', collection.name)
                 for obj in collection.objects:
                     delete(obj)
                 bpy.data.collections.remove(collection)
@@ -259,14 +278,13 @@ def set_default_stage():
     unhide_all()
     unselect_all()
 
+    # Only objects which are not in object mode need a mode switch.
+    # Leaving edit mode on one object also leaves it on every other object that is edited together with it
     for obj in get_objects():
-        set_active(obj)
-        switch('OBJECT')
-        if obj.type == 'ARMATURE':
-            # obj.data.pose_position = 'REST'
-            pass
-
-        select(obj, False)
+        if obj.mode != 'OBJECT':
+            set_active(obj)
+            switch('OBJECT')
+            select(obj, False)
 
     armature = get_armature()
     if armature:
@@ -318,15 +336,9 @@ def remove_unused_vertex_groups(ignore_main_bones=False):
     for mesh in get_meshes_objects(mode=2):
         mesh.update_from_editmode()
 
-        vgroup_used = {i: False for i, k in enumerate(mesh.vertex_groups)}
-
-        for v in mesh.data.vertices:
-            for g in v.groups:
-                if g.weight > 0.0:
-                    vgroup_used[g.group] = True
-
-        for i, used in sorted(vgroup_used.items(), reverse=True):
-            if not used:
+        used_groups = WeightIndex(mesh).get_used_groups()
+        for i in reversed(range(len(used_groups))):
+            if not used_groups[i]:
                 if ignore_main_bones and mesh.vertex_groups[i].name in Bones.dont_delete_these_main_bones:
                     continue
                 mesh.vertex_groups.remove(mesh.vertex_groups[i])
@@ -339,15 +351,9 @@ def remove_unused_vertex_groups_of_mesh(mesh):
     unselect_all()
     mesh.update_from_editmode()
 
-    vgroup_used = {i: False for i, k in enumerate(mesh.vertex_groups)}
-
-    for v in mesh.data.vertices:
-        for g in v.groups:
-            if g.weight > 0.0:
-                vgroup_used[g.group] = True
-
-    for i, used in sorted(vgroup_used.items(), reverse=True):
-        if not used:
+    used_groups = WeightIndex(mesh).get_used_groups()
+    for i in reversed(range(len(used_groups))):
+        if not used_groups[i]:
             mesh.vertex_groups.remove(mesh.vertex_groups[i])
             remove_count += 1
     return remove_count
@@ -695,6 +701,103 @@ def get_texture_sizes(self, context):
     return bpy.types.Object.Enum
 
 
+# Names of the meshes of every armature in view layer order, rebuilt after the scene changed
+meshes_index = None
+meshes_index_object_count = 0
+
+# Corrupted meshes can only come from an import, so they are only searched for after one.
+# A call only checks its own meshes, the names are kept until every mesh of the scene has been checked
+meshes_need_check = True
+meshes_checked = set()
+
+
+def invalidate_meshes_index():
+    global meshes_index
+    meshes_index = None
+
+
+def request_meshes_check():
+    global meshes_need_check
+    meshes_need_check = True
+    meshes_checked.clear()
+
+
+@persistent
+def scene_update_handler(*args):
+    invalidate_meshes_index()
+
+
+@persistent
+def load_handler(*args):
+    invalidate_meshes_index()
+    request_meshes_check()
+
+
+def register_handlers():
+    unregister_handlers()
+    bpy.app.handlers.depsgraph_update_post.append(scene_update_handler)
+    bpy.app.handlers.undo_post.append(scene_update_handler)
+    bpy.app.handlers.redo_post.append(scene_update_handler)
+    bpy.app.handlers.load_post.append(load_handler)
+
+
+def unregister_handlers():
+    # Handlers are compared by name, so the ones of an older reloaded version of this module get removed as well
+    for handlers in (bpy.app.handlers.depsgraph_update_post, bpy.app.handlers.undo_post,
+                     bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        for handler in list(handlers):
+            if getattr(handler, '__name__', None) in ('scene_update_handler', 'load_handler') \
+                    and getattr(handler, '__module__', None) == __name__:
+                handlers.remove(handler)
+
+
+def get_mesh_armature_names(ob):
+    # The armatures a mesh belongs to, either as its parent or as the parent of its parent
+    names = []
+    if ob.parent:
+        if ob.parent.type == 'ARMATURE':
+            names.append(ob.parent.name)
+        if ob.parent.parent and ob.parent.parent.type == 'ARMATURE' and ob.parent.parent.name not in names:
+            names.append(ob.parent.parent.name)
+    return names
+
+
+def get_armature_child_mesh_names(armature, objects):
+    # The names of the meshes get_mesh_armature_names() assigns to this armature, read from Blender's parent relations
+    names = set()
+    for child in armature.children:
+        if child.type == 'MESH' and child.name in objects:
+            names.add(child.name)
+        for grandchild in child.children:
+            if grandchild.type == 'MESH' and grandchild.name in objects:
+                names.add(grandchild.name)
+    return names
+
+
+def get_armature_meshes(armature_name):
+    global meshes_index, meshes_index_object_count
+    objects = get_objects()
+
+    # The handlers don't run in the middle of an operator, so objects added or removed by it are noticed by the count.
+    # Removed, renamed and reparented meshes are noticed by comparing the cached names with the children of the armature
+    if meshes_index is not None and meshes_index_object_count == len(objects) and armature_name in meshes_index:
+        armature = objects.get(armature_name)
+        names = meshes_index[armature_name]
+        if armature and armature.type == 'ARMATURE' and set(names) == get_armature_child_mesh_names(armature, objects):
+            return [objects[name] for name in names]
+
+    meshes_index = {}
+    meshes_index_object_count = len(objects)
+    for ob in objects:
+        if ob.type == 'ARMATURE':
+            meshes_index.setdefault(ob.name, [])
+        elif ob.type == 'MESH':
+            for name in get_mesh_armature_names(ob):
+                meshes_index.setdefault(name, []).append(ob.name)
+
+    return [objects[name] for name in meshes_index.get(armature_name, [])]
+
+
 def get_meshes_objects(armature_name=None, mode=0, check=True, visible_only=False):
     # Modes:
     # 0 = With armatures only
@@ -708,36 +811,35 @@ def get_meshes_objects(armature_name=None, mode=0, check=True, visible_only=Fals
             armature_name = armature.name
 
     meshes = []
-    for ob in get_objects():
-        if ob.type == 'MESH':
-            if mode == 0 or mode == 5:
-                if ob.parent:
-                    if ob.parent.type == 'ARMATURE' and ob.parent.name == armature_name:
-                        meshes.append(ob)
-                    elif ob.parent.parent and ob.parent.parent.type == 'ARMATURE' and ob.parent.parent.name == armature_name:
+    if mode == 0 or mode == 5:
+        if armature_name:
+            meshes = get_armature_meshes(armature_name)
+    else:
+        for ob in get_objects():
+            if ob.type == 'MESH':
+                if mode == 1:
+                    if not ob.parent:
                         meshes.append(ob)
 
-            elif mode == 1:
-                if not ob.parent:
+                elif mode == 2:
                     meshes.append(ob)
 
-            elif mode == 2:
-                meshes.append(ob)
-
-            elif mode == 3:
-                if is_selected(ob):
-                    meshes.append(ob)
+                elif mode == 3:
+                    if is_selected(ob):
+                        meshes.append(ob)
 
     if visible_only:
-        for mesh in meshes:
-            if is_hidden(mesh):
-                meshes.remove(mesh)
+        meshes = [mesh for mesh in meshes if not is_hidden(mesh)]
 
     # Check for broken meshes and delete them
-    if check:
+    global meshes_need_check
+    if check and meshes_need_check:
         current_active = get_active()
         to_remove = []
         for mesh in meshes:
+            if mesh.name in meshes_checked:
+                continue
+            meshes_checked.add(mesh.name)
             selected = is_selected(mesh)
             # print(mesh.name, mesh.users)
             set_active(mesh)
@@ -756,6 +858,10 @@ def get_meshes_objects(armature_name=None, mode=0, check=True, visible_only=Fals
         if current_active:
             set_active(current_active)
 
+        if all(ob.name in meshes_checked for ob in get_objects() if ob.type == 'MESH'):
+            meshes_need_check = False
+            meshes_checked.clear()
+
     return meshes
 
 
@@ -995,18 +1101,13 @@ def separate_by_shape_keys(context, mesh):
     bpy.ops.mesh.select_all(action='DESELECT')
 
     switch('OBJECT')
-    selected_count = 0
-    max_count = 0
-    if has_shapekeys(mesh):
-        for kb in mesh.data.shape_keys.key_blocks:
-            for i, (v0, v1) in enumerate(zip(kb.relative_key.data, kb.data)):
-                max_count += 1
-                if v0.co != v1.co:
-                    mesh.data.vertices[i].select = True
-                    selected_count += 1
+    if not has_shapekeys(mesh):
+        return False
 
-    if not selected_count or selected_count == max_count:
+    moved = get_moved_vertices(mesh.data.shape_keys.key_blocks, len(mesh.data.vertices))
+    if not moved.any() or moved.all():
         return False
+    mesh.data.vertices.foreach_set('select', moved)
 
     switch('EDIT')
     bpy.ops.mesh.select_all(action='INVERT')
@@ -1043,19 +1144,14 @@ def separate_by_cats_protection(context, mesh):
     bpy.ops.mesh.select_all(action='DESELECT')
 
     switch('OBJECT')
-    selected_count = 0
-    max_count = 0
-    if has_shapekeys(mesh):
-        for kb in mesh.data.shape_keys.key_blocks:
-            if kb.name == 'Basis Original':
-                for i, (v0, v1) in enumerate(zip(kb.relative_key.data, kb.data)):
-                    max_count += 1
-                    if v0.co != v1.co:
-                        mesh.data.vertices[i].select = True
-                        selected_count += 1
-
-    if not selected_count or selected_count == max_count:
+    if not has_shapekeys(mesh):
+        return False
+
+    key_blocks = [kb for kb in mesh.data.shape_keys.key_blocks if kb.name == 'Basis Original']
+    moved = get_moved_vertices(key_blocks, len(mesh.data.vertices))
+    if not moved.any() or moved.all():
         return False
+    mesh.data.vertices.foreach_set('select', moved)
 
     switch('EDIT')
     bpy.ops.mesh.select_all(action='INVERT')
@@ -1121,10 +1217,40 @@ def can_remove_shapekey(key_block):
         return True
     if key_block.relative_key == key_block:
         return False  # Basis
-    for v0, v1 in zip(key_block.relative_key.data, key_block.data):
-        if v0.co != v1.co:
-            return False
-    return True
+    return not get_moved_vertices([key_block], len(key_block.data)).any()
+
+
+def get_moved_vertices(key_blocks, vertex_count):
+    # Returns a bool array which is True for every vertex that one of the key blocks moves away from its relative key.
+    # Each key block is read with a single foreach_get, relative keys are only read once
+    moved = np.zeros(vertex_count, dtype=bool)
+    relative_cos = {}
+
+    for kb in key_blocks:
+        relative_key = kb.relative_key
+        if relative_key == kb:
+            continue
+
+        relative_co = relative_cos.get(relative_key.name)
+        if relative_co is None:
+            relative_co = np.empty(vertex_count * 3, dtype=np.float32)
+            relative_key.data.foreach_get('co', relative_co)
+            relative_cos[relative_key.name] = relative_co
+
+        co = np.empty(vertex_count * 3, dtype=np.float32)
+        kb.data.foreach_get('co', co)
+        moved |= floats_differ(co, relative_co).reshape(-1, 3).any(axis=1)
+
+    return moved
+
+
+def floats_differ(a, b):
+    # Compares float32 arrays the same way as mathutils.Vector does, values that are one ulp apart are still equal
+    a = a.view(np.int32).astype(np.int64)
+    b = b.view(np.int32).astype(np.int64)
+    a = np.where(a < 0, -(a & 0x7fffffff), a)
+    b = np.where(b < 0, -(b & 0x7fffffff), b)
+    return np.abs(a - b) > 1
 
 
 def separate_by_verts():
@@ -1288,56 +1414,83 @@ def sort_shape_keys(mesh_name, shape_key_order=None):
         if shape not in order:
             order.append(shape)
 
+    key_blocks = mesh.data.shape_keys.key_blocks
+    names = [shapekey.name for shapekey in key_blocks]
+    target = get_shape_key_order(names, order)
+
+    # Keys which are already in the right order stay where they are, all others get moved to the top or bottom once
+    position = {name: index for index, name in enumerate(names)}
+    keep_start, keep_end = get_sorted_run(target, position)
+    # The first key goes to the top before the others get inserted below it
+    moves = [(name, len(names) - 1) for name in target[keep_end:]] + [(name, 0) for name in target[:min(keep_start, 1)]]
+    moves += [(name, 1) for name in reversed(target[1:keep_start])]
+
     wm = bpy.context.window_manager
     current_step = 0
-    wm.progress_begin(current_step, len(order))
+    wm.progress_begin(current_step, len(moves))
 
-    i = 0
-    for name in order:
-        if name == 'Basis' and 'Basis' not in mesh.data.shape_keys.key_blocks:
-            i += 1
-            current_step += 1
-            wm.progress_update(current_step)
-            continue
+    for name, new_index in moves:
+        # Read the real index every time, Blender decides where a moved key ends up
+        index = key_blocks.find(name)
+        move_types = get_shape_key_moves(index, new_index, len(names))
+        if move_types:
+            mesh.active_shape_key_index = index
+            for move_type in move_types:
+                bpy.ops.object.shape_key_move(type=move_type)
 
-        for index, shapekey in enumerate(mesh.data.shape_keys.key_blocks):
-            if shapekey.name == name:
+        current_step += 1
+        wm.progress_update(current_step)
 
-                mesh.active_shape_key_index = index
-                new_index = i
-                index_diff = (index - new_index)
+    mesh.active_shape_key_index = 0
 
-                if new_index >= len(mesh.data.shape_keys.key_blocks):
-                    bpy.ops.object.shape_key_move(type='BOTTOM')
-                    break
+    wm.progress_end()
 
-                position_correct = False
-                if 0 <= index_diff <= (new_index - 1):
-                    while position_correct is False:
-                        if mesh.active_shape_key_index != new_index:
-                            bpy.ops.object.shape_key_move(type='UP')
-                        else:
-                            position_correct = True
-                else:
-                    if mesh.active_shape_key_index > new_index:
-                        bpy.ops.object.shape_key_move(type='TOP')
 
-                    position_correct = False
-                    while position_correct is False:
-                        if mesh.active_shape_key_index != new_index:
-                            bpy.ops.object.shape_key_move(type='DOWN')
-                        else:
-                            position_correct = True
+def get_shape_key_moves(index, new_index, count):
+    # Returns the shape_key_move types which move the key at index to new_index, which is 0, 1 or the last index.
+    # TOP moves a key only up to index 1, below the reference key. Only a key which is at index 1 already replaces the reference key
+    if index == new_index:
+        return []
+    if new_index == count - 1:
+        return ['BOTTOM']
+    if new_index == 1:
+        return ['DOWN'] if index == 0 else ['TOP']
+    return ['TOP'] if index == 1 else ['TOP', 'TOP']
 
-                i += 1
-                break
 
-        current_step += 1
-        wm.progress_update(current_step)
+def get_shape_key_order(names, order):
+    # Returns the sorted shape key names. The keys of the order list are moved to the front in this order,
+    # all other keys keep their order behind them. If there is no 'Basis', the first key keeps its place
+    names = list(names)
+    i = 0
+    for name in order:
+        if name == 'Basis' and 'Basis' not in names:
+            i += 1
+            continue
+        if name not in names:
+            continue
 
-    mesh.active_shape_key_index = 0
+        names.remove(name)
+        if i >= len(names) + 1:
+            names.append(name)
+            continue
 
-    wm.progress_end()
+        names.insert(i, name)
+        i += 1
+
+    return names
+
+
+def get_sorted_run(target, position):
+    # Finds the longest slice of the target order which already has the same order in the current positions
+    best_start, best_end = 0, 0
+    start = 0
+    for index in range(1, len(target) + 1):
+        if index == len(target) or position[target[index]] < position[target[index - 1]]:
+            if index - start > best_end - best_start:
+                best_start, best_end = start, index
+            start = index
+    return best_start, best_end
 
 
 def isEmptyGroup(group_name):
@@ -1348,35 +1501,20 @@ def isEmptyGroup(group_name):
     if vgroup is None:
         return True
 
-    for vert in mesh.data.vertices:
-        for group in vert.groups:
-            if group.group == vgroup.index:
-                if group.weight > 0:
-                    return False
-
-    return True
+    return WeightIndex(mesh).is_group_empty(vgroup.index)
 
 
 def removeEmptyGroups(obj, thres=0):
-    z = []
-    for v in obj.data.vertices:
-        for g in v.groups:
-            if g.weight > thres:
-                if g not in z:
-                    z.append(obj.vertex_groups[g.group])
-    for r in obj.vertex_groups:
-        if r not in z:
-            obj.vertex_groups.remove(r)
+    used_groups = WeightIndex(obj).get_used_groups(thres)
+    for i in reversed(range(len(used_groups))):
+        if not used_groups[i]:
+            obj.vertex_groups.remove(obj.vertex_groups[i])
 
 
 def removeZeroVerts(obj, thres=0):
-    for v in obj.data.vertices:
-        z = []
-        for g in v.groups:
-            if not g.weight > thres:
-                z.append(g)
-        for r in z:
-            obj.vertex_groups[g.group].remove([v.index])
+    # Removes the vertices from every group they have a weight of thres or less in, with one call per group
+    for group, vertices in WeightIndex(obj).get_zero_weight_vertices(thres).items():
+        obj.vertex_groups[group].remove(vertices)
 
 
 def delete_hierarchy(parent):
@@ -1401,6 +1539,7 @@ def delete(obj):
     if obj.parent:
         for child in obj.children:
             child.parent = obj.parent
+        invalidate_meshes_index()
 
     objs = bpy.data.objects
     objs.remove(objs[obj.name], do_unlink=True)
@@ -1443,16 +1582,12 @@ def delete_zero_weight(armature_name=None, ignore=''):
     vertex_group_names_used = set()
     vertex_group_name_to_objects_having_same_named_vertex_group = dict()
     for objects in get_meshes_objects(armature_name=armature_name):
-        vertex_group_id_to_vertex_group_name = dict()
         for vertex_group in objects.vertex_groups:
-            vertex_group_id_to_vertex_group_name[vertex_group.index] = vertex_group.name
             if vertex_group.name not in vertex_group_name_to_objects_having_same_named_vertex_group:
                 vertex_group_name_to_objects_having_same_named_vertex_group[vertex_group.name] = set()
             vertex_group_name_to_objects_having_same_named_vertex_group[vertex_group.name].add(objects)
-        for vertex in objects.data.vertices:
-            for group in vertex.groups:
-                if group.weight > 0:
-                    vertex_group_names_used.add(vertex_group_id_to_vertex_group_name.get(group.group))
+        used_groups = WeightIndex(objects).get_used_groups()
+        vertex_group_names_used.update(objects.vertex_groups[i].name for i in used_groups.nonzero()[0].tolist())
 
     not_used_bone_names = bone_names_to_work_on - vertex_group_names_used
 
@@ -1677,13 +1812,10 @@ def remove_doubles(mesh, threshold, save_shapes=True):
     bpy.ops.mesh.select_all(action='DESELECT')
 
     if save_shapes and has_shapekeys(mesh):
+        # Select every vertex that is moved by a shape key, the rest gets merged
         switch('OBJECT')
-        for kb in mesh.data.shape_keys.key_blocks:
-            i = 0
-            for v0, v1 in zip(kb.relative_key.data, kb.data):
-                if v0.co != v1.co:
-                    mesh.data.vertices[i].select = True
-                i += 1
+        moved = get_moved_vertices(mesh.data.shape_keys.key_blocks, len(mesh.data.vertices))
+        mesh.data.vertices.foreach_set('select', moved)
         switch('EDIT')
         bpy.ops.mesh.select_all(action='INVERT')
     else:
@@ -1697,12 +1829,11 @@ def remove_doubles(mesh, threshold, save_shapes=True):
 
 
 def get_tricount(obj):
-    # Triangulates with Bmesh to avoid messing with the original geometry
-    bmesh_mesh = bmesh.new()
-    bmesh_mesh.from_mesh(obj.data)
-
-    bmesh.ops.triangulate(bmesh_mesh, faces=bmesh_mesh.faces[:])
-    return len(bmesh_mesh.faces)
+    # A polygon with n corners always becomes n - 2 triangles, so the count is sum(loop_total - 2).
+    # Every loop belongs to exactly one polygon, which turns that sum into a simple difference of lengths.
+    # This is cheap enough to call on every redraw and can never get out of date, unlike a cached value
+    mesh = obj.data
+    return len(mesh.loops) - 2 * len(mesh.polygons)
 
 
 def get_bone_orientations(armature):
@@ -1740,6 +1871,12 @@ def clean_material_names(mesh):
 
 
 def mix_weights(mesh, vg_from, vg_to, mix_strength=1.0, mix_mode='ADD', delete_old_vg=True):
+    # Inside of a weight_transfer() block of this mesh the mix only gets calculated and is written back at the end
+    transfer = active_weight_transfers.get(mesh.name)
+    if transfer:
+        transfer.mix(vg_from, vg_to, mix_strength=mix_strength, mix_mode=mix_mode, delete_old_vg=delete_old_vg)
+        return
+
     mesh.active_shape_key_index = 0
     mod = mesh.modifiers.new("VertexWeightMix", 'VERTEX_WEIGHT_MIX')
     mod.vertex_group_a = vg_to
@@ -1753,6 +1890,181 @@ def mix_weights(mesh, vg_from, vg_to, mix_strength=1.0, mix_mode='ADD', delete_o
     mesh.active_shape_key_index = 0  # This line fixes a visual bug in 2.80 which causes random weights to be stuck after being merged
 
 
+# The weight transfers which are currently collecting the mix_weights() calls, by mesh name
+active_weight_transfers = {}
+
+
+@contextlib.contextmanager
+def weight_transfer(mesh):
+    # Collects all mix_weights() calls of the mesh inside of the block and writes every changed group back once.
+    # The weights of the mesh should not be changed in any other way inside of the block
+    transfer = active_weight_transfers.get(mesh.name)
+    if transfer:
+        yield transfer
+        return
+
+    transfer = WeightTransfer(mesh)
+    active_weight_transfers[mesh.name] = transfer
+    try:
+        yield transfer
+    finally:
+        del active_weight_transfers[mesh.name]
+        transfer.apply()
+
+
+class WeightTransfer:
+    # Does the same as the VertexWeightMix modifier of mix_weights(), but on arrays.
+    # All weights are read once, the mixes are calculated in memory and each changed group is written back once.
+    # Removed source groups are removed from the mesh right away, so code between two mixes sees the same
+    # vertex groups as it would with the modifier
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.changed = set()
+        self.weights = {}
+
+        vertices, groups, weights = get_vertex_group_weights(mesh)
+        order = np.argsort(groups, kind='stable')
+        vertices = vertices[order]
+        groups = groups[order]
+        weights = weights[order].astype(np.float32)
+        unique_groups, starts = np.unique(groups, return_index=True)
+        ends = np.append(starts[1:], len(groups))
+        for group, start, end in zip(unique_groups.tolist(), starts.tolist(), ends.tolist()):
+            self.weights[mesh.vertex_groups[group].name] = (vertices[start:end], weights[start:end])
+
+    def get(self, name):
+        # Groups which were created after the weights got read are still empty
+        return self.weights.get(name, (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)))
+
+    def mix(self, vg_from, vg_to, mix_strength=1.0, mix_mode='ADD', delete_old_vg=True):
+        mesh = self.mesh
+        if not mesh.vertex_groups.get(vg_from):
+            return
+
+        # Like the modifier with mix_set 'B', every vertex of the source group gets mixed into the target group
+        if mesh.vertex_groups.get(vg_to):
+            indices_to, weights_to = self.get(vg_to)
+            indices_from, weights_from = self.get(vg_from)
+
+            # Find the current target weights of the source vertices, vertices outside of the target group have 0
+            if len(indices_to):
+                positions = np.minimum(np.searchsorted(indices_to, indices_from), len(indices_to) - 1)
+                found = indices_to[positions] == indices_from
+                weights_a = np.where(found, weights_to[positions], 0).astype(np.float32)
+            else:
+                positions = np.zeros(len(indices_from), dtype=np.int64)
+                found = np.zeros(len(indices_from), dtype=bool)
+                weights_a = np.zeros(len(indices_from), dtype=np.float32)
+
+            mixed = mix_weight_arrays(weights_a, weights_from, mix_mode)
+            strength = np.float32(mix_strength)
+            result = np.clip(mixed * strength + weights_a * (np.float32(1) - strength), 0, 1).astype(np.float32)
+
+            weights_to = weights_to.copy()
+            weights_to[positions[found]] = result[found]
+            indices_to = np.concatenate((indices_to, indices_from[~found]))
+            weights_to = np.concatenate((weights_to, result[~found]))
+            order = np.argsort(indices_to, kind='stable')
+            self.weights[vg_to] = (indices_to[order], weights_to[order])
+            self.changed.add(vg_to)
+
+        if delete_old_vg:
+            mesh.vertex_groups.remove(mesh.vertex_groups.get(vg_from))
+            self.weights.pop(vg_from, None)
+            self.changed.discard(vg_from)
+
+    def apply(self):
+        mesh = self.mesh
+        for name in self.changed:
+            vertex_group = mesh.vertex_groups.get(name)
+            if vertex_group:
+                indices, weights = self.weights[name]
+                add_vertex_group_weights(vertex_group, indices, weights)
+        self.changed = set()
+        mesh.active_shape_key_index = 0  # This line fixes a visual bug in 2.80 which causes random weights to be stuck after being merged
+
+
+def mix_weight_arrays(weights_a, weights_b, mix_mode):
+    # The mix modes of the VertexWeightMix modifier, the result is clamped later
+    if mix_mode == 'SET':
+        return weights_b
+    if mix_mode == 'ADD':
+        return weights_a + weights_b
+    if mix_mode == 'SUB':
+        return weights_a - weights_b
+    if mix_mode == 'MUL':
+        return weights_a * weights_b
+    if mix_mode == 'DIF':
+        return np.abs(weights_a - weights_b)
+    if mix_mode == 'AVG':
+        return (weights_a + weights_b) * np.float32(0.5)
+    if mix_mode == 'MIN':
+        return np.minimum(weights_a, weights_b)
+    if mix_mode == 'MAX':
+        return np.maximum(weights_a, weights_b)
+    raise ValueError('Unsupported mix mode: ' + mix_mode)
+
+
+def get_vertex_group_weights(mesh):
+    # Reads all vertex group memberships of the mesh into three columns: vertex index, group index and weight
+    # Vertex groups have no foreach_get, so this is the only pass over the vertices in Python
+    vertex_column = []
+    group_column = []
+    weight_column = []
+    for vertex in mesh.data.vertices:
+        index = vertex.index
+        for group in vertex.groups:
+            vertex_column.append(index)
+            group_column.append(group.group)
+            weight_column.append(group.weight)
+
+    return np.array(vertex_column, dtype=np.int64), np.array(group_column, dtype=np.int64), np.array(weight_column, dtype=np.float64)
+
+
+class WeightIndex:
+    # All vertex group memberships of a mesh, read once into a vertex, a group and a weight column.
+    # Build one index and ask it everything instead of walking the vertices for every question.
+    # It doesn't notice later changes to the weights, so build a new one after changing them
+    def __init__(self, mesh):
+        self.group_count = len(mesh.vertex_groups)
+        self.vertices, self.groups, self.weights = get_vertex_group_weights(mesh)
+
+    def get_used_groups(self, threshold=0.0):
+        # Bool array by group index, True if the group has at least one weight above the threshold
+        used = np.zeros(self.group_count, dtype=bool)
+        used[self.groups[self.weights > threshold]] = True
+        return used
+
+    def is_group_empty(self, group, threshold=0.0):
+        return not np.any((self.groups == group) & (self.weights > threshold))
+
+    def get_zero_weight_vertices(self, threshold=0.0):
+        # Returns {group index: [vertex indices]} of all memberships with a weight of threshold or less
+        zero = self.weights <= threshold
+        vertices = self.vertices[zero]
+        groups = self.groups[zero]
+        order = np.argsort(groups, kind='stable')
+        vertices = vertices[order]
+        groups = groups[order]
+        unique_groups, starts = np.unique(groups, return_index=True)
+        return {int(group): group_vertices.tolist() for group, group_vertices in zip(unique_groups, np.split(vertices, starts[1:]))}
+
+
+def add_vertex_group_weights(vertex_group, indices, weights, add_type='REPLACE'):
+    # Adds the weights with one add() call per distinct weight instead of one call per vertex
+    # The weights are grouped by their float32 value, which is what Blender stores anyway
+    indices = np.asarray(indices, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float32)
+    if not len(indices):
+        return
+
+    values, inverse = np.unique(weights, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    splits = np.cumsum(np.bincount(inverse, minlength=len(values)))[:-1]
+    for value, group_indices in zip(values, np.split(indices[order], splits)):
+        vertex_group.add(group_indices.tolist(), float(value), add_type)
+
+
 def get_user_preferences():
     return bpy.context.user_preferences if hasattr(bpy.context, 'user_preferences') else bpy.context.preferences
 
@@ -25,7 +25,9 @@
 # Edits by:
 
 import bpy
-import math
+import json
+import time
+import numpy as np
 
 from . import common as Common
 from . import armature_bones as Bones
@@ -36,6 +38,15 @@ from .translations import t
 ignore_shapes = []
 ignore_meshes = []
 
+# The decimation plan is accepted once it is this close to max_tris, relative to max_tris
+plan_tolerance = 0.005
+plan_iterations = 10
+
+analysis_modes = ['SAFE', 'HALF', 'SMART', 'FULL', 'CUSTOM']
+
+# Vertex group factor used when the fingers are protected, high enough that finger vertices get collapsed last
+finger_protection_factor = 1000.0
+
 
 @register_wrap
 class ScanButton(bpy.types.Operator):
@@ -172,18 +183,20 @@ class AutoDecimateButton(bpy.types.Operator):
             self.report({'ERROR'}, t('AutoDecimateButton.error.noMesh'))
             return {'FINISHED'}
 
-        saved_data = Common.SavedData()
+        with Common.saved_stage():
+            if context.scene.decimation_mode != 'CUSTOM':
+                mesh = Common.join_meshes(repair_shape_keys=False, armature_name=self.armature_name)
+                if self.seperate_materials:
+                    Common.separate_by_materials(context, mesh)
 
-        if context.scene.decimation_mode != 'CUSTOM':
-            mesh = Common.join_meshes(repair_shape_keys=False, armature_name=self.armature_name)
-            if self.seperate_materials:
-                Common.separate_by_materials(context, mesh)
-
-        self.decimate(context)
-
-        Common.join_meshes(armature_name=self.armature_name)
+            try:
+                self.decimate(context)
+            finally:
+                # The decimation weights are only needed while decimating
+                for mesh in Common.get_meshes_objects(armature_name=self.armature_name):
+                    remove_decimation_weights(mesh)
 
-        saved_data.load()
+            Common.join_meshes(armature_name=self.armature_name)
 
         return {'FINISHED'}
 
@@ -192,7 +205,6 @@ class AutoDecimateButton(bpy.types.Operator):
         Common.set_default_stage()
 
         custom_decimation = context.scene.decimation_mode == 'CUSTOM'
-        full_decimation = context.scene.decimation_mode == 'FULL'
         half_decimation = context.scene.decimation_mode == 'HALF'
         safe_decimation = context.scene.decimation_mode == 'SAFE'
         smart_decimation = context.scene.decimation_mode == 'SMART'
@@ -213,169 +225,50 @@ class AutoDecimateButton(bpy.types.Operator):
             Common.switch('OBJECT')
             if context.scene.decimation_remove_doubles:
                 Common.remove_doubles(mesh, 0.00001, save_shapes=True)
-            current_tris_count += Common.get_tricount(mesh.data.polygons)
-
-        if animation_weighting:
-            for mesh in meshes_obj:
-                # Weight by multiplied bone weights for every pair of bones.
-                # This is O(n*m^2) for n verts and m bones, generally runs relatively quickly.
-                weights = dict()
-                for vertex in mesh.data.vertices:
-                    v_weights = [group.weight for group in vertex.groups]
-                    v_mults = []
-                    for idx1, w1 in enumerate(vertex.groups):
-                        for idx2, w2 in enumerate(vertex.groups):
-                            if idx1 != idx2:
-                                # Weight [vgroup * vgroup] for index = <mult>
-                                if (w1.group, w2.group) not in weights:
-                                    weights[(w1.group, w2.group)] = dict()
-                                weights[(w1.group, w2.group)][vertex.index] = w1.weight * w2.weight
-
-                # Normalize per vertex group pair
-                normalizedweights = dict()
-                for pair, weighting in weights.items():
-                    m_min = 1
-                    m_max = 0
-                    for _, weight in weighting.items():
-                        m_min = min(m_min, weight)
-                        m_max = max(m_max, weight)
-
-                    if pair not in normalizedweights:
-                        normalizedweights[pair] = dict()
-                    for v_index, weight in weighting.items():
-                        try:
-                            normalizedweights[pair][v_index] = (weight - m_min) / (m_max - m_min)
-                        except ZeroDivisionError:
-                            normalizedweights[pair][v_index] = weight
-
-                newweights = dict()
-                for pair, weighting in normalizedweights.items():
-                    for v_index, weight in weighting.items():
-                        try:
-                            newweights[v_index] = max(newweights[v_index], weight)
-                        except KeyError:
-                            newweights[v_index] = weight
-
-                s_weights = dict()
-
-                # Weight by relative shape key movement. This is kind of slow, but not too bad. It's O(n*m) for n verts and m shape keys,
-                # but shape keys contain every vert (not just the ones they impact)
-                # For shape key in shape keys:
-                if mesh.data.shape_keys is not None:
-                    for key_block in mesh.data.shape_keys.key_blocks[1:]:
-                        basis = mesh.data.shape_keys.key_blocks[0]
-                        s_weights[key_block.name] = dict()
-
-                        for idx, vert in enumerate(key_block.data):
-                            s_weights[key_block.name][idx] = math.sqrt(math.pow(basis.data[idx].co[0] - vert.co[0], 2.0) +
-                                                                            math.pow(basis.data[idx].co[1] - vert.co[1], 2.0) +
-                                                                            math.pow(basis.data[idx].co[2] - vert.co[2], 2.0))
-
-                # normalize min/max vert movement
-                s_normalizedweights = dict()
-                for keyname, weighting in s_weights.items():
-                    m_min = math.inf
-                    m_max = 0
-                    for _, weight in weighting.items():
-                        m_min = min(m_min, weight)
-                        m_max = max(m_max, weight)
-
-                    if keyname not in s_normalizedweights:
-                        s_normalizedweights[keyname] = dict()
-                    for v_index, weight in weighting.items():
-                        try:
-                            s_normalizedweights[keyname][v_index] = (weight - m_min) / (m_max - m_min)
-                        except ZeroDivisionError:
-                            s_normalizedweights[keyname][v_index] = weight
-
-                # find max normalized movement over all shape keys
-                for pair, weighting in s_normalizedweights.items():
-                    for v_index, weight in weighting.items():
-                        try:
-                            newweights[v_index] = max(newweights[v_index], weight)
-                        except KeyError:
-                            newweights[v_index] = weight
-
-                # TODO: ignore shape keys which move very little?
-                context.view_layer.objects.active = mesh
-                bpy.ops.object.vertex_group_add()
-                mesh.vertex_groups[-1].name = "CATS Animation"
-                for idx, weight in newweights.items():
-                    mesh.vertex_groups[-1].add([idx], weight, "REPLACE")
-
-        if save_fingers:
+            current_tris_count += Common.get_tricount(mesh)
+
+        # The decimation weights decide which vertices get collapsed last.
+        # Protected fingers get the full weight with a much higher factor than the animation weighting,
+        # so the animation weights are scaled down to keep their own strength
+        use_weights = animation_weighting or save_fingers
+        weights_factor = finger_protection_factor if save_fingers else animation_weighting_factor
+        if use_weights:
             for mesh in meshes_obj:
-                if len(mesh.vertex_groups) > 0:
-                    Common.set_active(mesh)
-                    Common.switch('EDIT')
-
-                    bpy.ops.mesh.select_mode(type='VERT')
-
-                    for finger in Bones.bone_finger_list:
-                        print(finger)
-                        vgs = [mesh.vertex_groups.get(finger + 'L'), mesh.vertex_groups.get(finger + 'R')]
-                        for vg in vgs:
-                            if vg:
-                                bpy.ops.object.vertex_group_set_active(group=vg.name)
-                                bpy.ops.object.vertex_group_select()
-                                try:
-                                    bpy.ops.mesh.separate(type='SELECTED')
-                                except RuntimeError:
-                                    pass
-
-                    bpy.ops.object.mode_set(mode='OBJECT')
+                weights = np.zeros(len(mesh.data.vertices))
+                if animation_weighting:
+                    # TODO: ignore shape keys which move very little?
+                    indices, animation_weights = get_animation_weights(mesh)
+                    weights[indices] = animation_weights * (animation_weighting_factor / weights_factor if save_fingers else 1)
+                if save_fingers:
+                    weights[get_finger_mask(mesh)] = 1
 
-                    Common.unselect_all()
+                indices = np.flatnonzero(weights)
+                remove_decimation_weights(mesh)
+                vertex_group = mesh.vertex_groups.new(name="CATS Animation")
+                Common.add_vertex_group_weights(vertex_group, indices, weights[indices])
 
         for mesh in meshes_obj:
             Common.set_active(mesh)
             tris = Common.get_tricount(mesh)
 
-            if custom_decimation and mesh.name in ignore_meshes:
+            shape_key_names = mesh.data.shape_keys.key_blocks.keys() if Common.has_shapekeys(mesh) else []
+            action = get_decimation_action(context.scene.decimation_mode, mesh.name, shape_key_names)
+            if action == 'IGNORE':
                 Common.unselect_all()
                 continue
 
-            if Common.has_shapekeys(mesh):
-                if full_decimation:
-                    bpy.ops.object.shape_key_remove(all=True)
-                    meshes.append((mesh, tris))
-                    tris_count += tris
-                elif smart_decimation:
-                    if len(mesh.data.shape_keys.key_blocks) == 1:
-                        bpy.ops.object.shape_key_remove(all=True)
-                    else:
-                        mesh.active_shape_key_index = 0
-                        # Sanity check, make sure basis isn't against something weird
-                        mesh.active_shape_key.relative_key = mesh.active_shape_key
-                        # Add a duplicate basis key which we un-apply to fix shape keys
-                        bpy.ops.object.shape_key_add(from_mix=False)
-                        mesh.active_shape_key.name = "CATS Basis"
-                        mesh.active_shape_key_index = 0
-                    meshes.append((mesh, tris))
-                    tris_count += tris
-                elif custom_decimation:
-                    found = False
-                    for shape in ignore_shapes:
-                        if shape in mesh.data.shape_keys.key_blocks:
-                            found = True
-                            break
-                    if found:
-                        Common.unselect_all()
-                        continue
-                    bpy.ops.object.shape_key_remove(all=True)
-                    meshes.append((mesh, tris))
-                    tris_count += tris
-                elif half_decimation and len(mesh.data.shape_keys.key_blocks) < 4:
-                    bpy.ops.object.shape_key_remove(all=True)
-                    meshes.append((mesh, tris))
-                    tris_count += tris
-                elif len(mesh.data.shape_keys.key_blocks) == 1:
-                    bpy.ops.object.shape_key_remove(all=True)
-                    meshes.append((mesh, tris))
-                    tris_count += tris
-            else:
-                meshes.append((mesh, tris))
-                tris_count += tris
+            if action == 'REMOVE_SHAPES':
+                bpy.ops.object.shape_key_remove(all=True)
+            elif action == 'KEEP_SHAPES':
+                mesh.active_shape_key_index = 0
+                # Sanity check, make sure basis isn't against something weird
+                mesh.active_shape_key.relative_key = mesh.active_shape_key
+                # Add a duplicate basis key which we un-apply to fix shape keys
+                bpy.ops.object.shape_key_add(from_mix=False)
+                mesh.active_shape_key.name = "CATS Basis"
+                mesh.active_shape_key_index = 0
+            meshes.append((mesh, tris))
+            tris_count += tris
 
             Common.unselect_all()
 
@@ -392,12 +285,6 @@ class AutoDecimateButton(bpy.types.Operator):
                 message.append(t('decimate.halfTryOptions'))
             elif custom_decimation:
                 message.append(t('decimate.customTryOptions'))
-            if save_fingers:
-                if full_decimation or smart_decimation:
-                    message.append(t('decimate.disableFingersOrIncrease'))
-                else:
-                    message[1] = message[1][:-1]
-                    message.append(t('decimate.disableFingers'))
             Common.show_error(6, message)
             return
 
@@ -414,6 +301,17 @@ class AutoDecimateButton(bpy.types.Operator):
 
         meshes.sort(key=lambda x: x[1])
 
+        # Measure how every mesh collapses and find the ratios that hit max_tris before anything gets applied
+        plan = plan_decimation(context, meshes, max_tris - current_tris_count + tris_count,
+                               use_weights, weights_factor, symmetry=smart_decimation)
+        planned_tris = current_tris_count - tris_count + sum(planned for _, planned in plan.values())
+        print('DECIMATION PLAN:')
+        for mesh_obj, tris in reversed(meshes):
+            ratio, planned = plan[mesh_obj.name]
+            print(' ', mesh_obj.name, tris, '->', planned, '(ratio ' + str(round(ratio, 4)) + ')')
+        print('  Total:', current_tris_count, '->', planned_tris, '/', max_tris)
+        self.report({'INFO'}, t('decimate.plan', tris=planned_tris, max_tris=max_tris))
+
         for mesh in reversed(meshes):
             mesh_obj = mesh[0]
             tris = mesh[1]
@@ -421,11 +319,7 @@ class AutoDecimateButton(bpy.types.Operator):
             Common.set_active(mesh_obj)
             print(mesh_obj.name)
 
-            # Calculate new decimation ratio
-            try:
-                decimation = (max_tris - current_tris_count + tris_count) / tris_count
-            except ZeroDivisionError:
-                decimation = 1
+            decimation = plan[mesh_obj.name][0]
             print(decimation)
 
             # Apply decimation mod
@@ -433,9 +327,9 @@ class AutoDecimateButton(bpy.types.Operator):
                 mod = mesh_obj.modifiers.new("Decimate", 'DECIMATE')
                 mod.ratio = decimation
                 mod.use_collapse_triangulate = True
-                if animation_weighting:
+                if use_weights:
                     mod.vertex_group = "CATS Animation"
-                    mod.vertex_group_factor = animation_weighting_factor
+                    mod.vertex_group_factor = weights_factor
                     mod.invert_vertex_group = True
                 Common.apply_modifier(mod)
             else:
@@ -460,8 +354,8 @@ class AutoDecimateButton(bpy.types.Operator):
                 #TODO: On many meshes, un-subdividing until it's near the target verts and then decimating the rest of the way
                 #      results in MUCH better topology. Something to figure out against 2.93
                 bpy.ops.mesh.decimate(ratio=decimation,
-                                      use_vertex_group=animation_weighting,
-                                      vertex_group_factor=animation_weighting_factor,
+                                      use_vertex_group=use_weights,
+                                      vertex_group_factor=weights_factor,
                                       invert_vertex_group=True,
                                       use_symmetry=True,
                                       symmetry_axis='X')
@@ -472,14 +366,9 @@ class AutoDecimateButton(bpy.types.Operator):
             print(tris_after)
 
             current_tris_count = current_tris_count - tris + tris_after
-            tris_count = tris_count - tris
             # Repair shape keys if SMART mode is enabled
             if smart_decimation and Common.has_shapekeys(mesh_obj):
-                for idx in range(1, len(mesh_obj.data.shape_keys.key_blocks) - 1):
-                    mesh_obj.active_shape_key_index = idx
-                    Common.switch('EDIT')
-                    bpy.ops.mesh.blend_from_shape(shape="CATS Basis", blend=-1.0, add=True)
-                    Common.switch('OBJECT')
+                repair_shape_keys(mesh_obj)
                 mesh_obj.shape_key_remove(key=mesh_obj.data.shape_keys.key_blocks["CATS Basis"])
                 mesh_obj.active_shape_key_index = 0
 
@@ -488,36 +377,363 @@ class AutoDecimateButton(bpy.types.Operator):
 
             Common.unselect_all()
 
-        # # Check if decimated correctly
-        # if decimation < 0:
-        #     print('')
-        #     print('RECHECK!')
-        #
-        #     current_tris_count = 0
-        #     tris_count = 0
-        #
-        #     for mesh in Common.get_meshes_objects():
-        #         Common.select(mesh)
-        #         tris = len(bpy.context.active_object.data.polygons)
-        #         tris_count += tris
-        #         print(tris_count)
-        #
-        #     for mesh in reversed(meshes):
-        #         mesh_obj = mesh[0]
-        #         Common.select(mesh_obj)
-        #
-        #         # Calculate new decimation ratio
-        #         decimation = (max_tris - tris_count) / tris_count
-        #         print(decimation)
-        #
-        #         # Apply decimation mod
-        #         mod = mesh_obj.modifiers.new("Decimate", 'DECIMATE')
-        #         mod.ratio = decimation
-        #         mod.use_collapse_triangulate = True
-        #         Common.apply_modifier(mod)
-        #
-        #         Common.unselect_all()
-        #         break
+
+@register_wrap
+class AnalyzeDecimationButton(bpy.types.Operator):
+    bl_idname = 'cats_decimation.analyze'
+    bl_label = t('AnalyzeDecimationButton.label')
+    bl_description = t('AnalyzeDecimationButton.desc')
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    filepath = bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob = bpy.props.StringProperty(default='*.json', options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = bpy.path.abspath('//decimation_analysis.json') if bpy.data.filepath else 'decimation_analysis.json'
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        meshes = Common.get_meshes_objects()
+        if not meshes:
+            self.report({'ERROR'}, t('AutoDecimateButton.error.noMesh'))
+            return {'CANCELLED'}
+
+        analysis = analyze_decimation(context, meshes, context.scene.max_tris)
+
+        print('DECIMATION ANALYSIS:', analysis['current_tris'], 'tris, max', analysis['max_tris'])
+        for mode, result in analysis['modes'].items():
+            print(' ', mode.ljust(6), 'locked:', result['locked_tris'], 'projected:', result['projected_tris'],
+                  'seconds:', round(result['projected_seconds'], 2), '' if result['fits'] else '(too many tris)')
+        for mesh in analysis['meshes']:
+            print(' ', mesh['name'], mesh['tris'], 'tris,', mesh['shape_keys'], 'shape keys')
+            for mode, result in mesh['modes'].items():
+                print('   ', mode.ljust(6), result['action'].ljust(13), result['projected_tris'])
+
+        if self.filepath:
+            with open(bpy.path.abspath(self.filepath), 'w', encoding="utf8") as outfile:
+                json.dump(analysis, outfile, ensure_ascii=False, indent=4)
+
+        self.report({'INFO'}, t('AnalyzeDecimationButton.success', count=len(meshes)))
+        return {'FINISHED'}
+
+
+def analyze_decimation(context, meshes, max_tris):
+    # Predicts what decimate() would do in every decimation mode without changing anything.
+    # The tris are counted on the evaluated meshes. The decimation time of a mesh is measured by evaluating it once
+    # with a temporary Decimate modifier
+    depsgraph = context.evaluated_depsgraph_get()
+    rows = []
+    all_shape_key_names = set()
+    for mesh in meshes:
+        shape_key_names = mesh.data.shape_keys.key_blocks.keys() if Common.has_shapekeys(mesh) else []
+        all_shape_key_names.update(shape_key_names)
+        rows.append({
+            'name': mesh.name,
+            'tris': Common.get_tricount(mesh.evaluated_get(depsgraph)),
+            'shape_keys': len(shape_key_names),
+            'shape_key_names': shape_key_names,
+        })
+
+    current_tris = sum(row['tris'] for row in rows)
+    ratio = min(max_tris / current_tris, 1) if current_tris else 1
+    for mesh, row in zip(meshes, rows):
+        row['decimate_seconds'] = measure_decimation_time(context, mesh, ratio) if ratio < 1 else 0
+
+    modes = {}
+    for mode in analysis_modes:
+        # Every mode except CUSTOM joins all meshes first, so they share the shape keys of the joined mesh
+        for row in rows:
+            if mode == 'CUSTOM':
+                row['action'] = get_decimation_action(mode, row['name'], row['shape_key_names'])
+            else:
+                row['action'] = get_decimation_action(mode, None, sorted(all_shape_key_names))
+
+        locked_tris = sum(row['tris'] for row in rows if row['action'] == 'IGNORE')
+        decimated_tris = current_tris - locked_tris
+        try:
+            mode_ratio = min(max((max_tris - locked_tris) / decimated_tris, 0), 1)
+        except ZeroDivisionError:
+            mode_ratio = 1
+
+        projected_tris = 0
+        projected_seconds = 0
+        for row in rows:
+            result = {'action': row['action'], 'locked_tris': row['tris'], 'projected_tris': row['tris']}
+            if row['action'] != 'IGNORE':
+                result['locked_tris'] = 0
+                result['projected_tris'] = round(row['tris'] * mode_ratio)
+                if mode_ratio < 1:
+                    projected_seconds += row['decimate_seconds']
+            row.setdefault('modes', {})[mode] = result
+            projected_tris += result['projected_tris']
+
+        modes[mode] = {
+            'locked_tris': locked_tris,
+            'projected_tris': projected_tris,
+            'projected_seconds': projected_seconds,
+            'fits': locked_tris <= max_tris,
+        }
+
+    for row in rows:
+        del row['shape_key_names']
+        del row['action']
+
+    return {
+        'max_tris': max_tris,
+        'current_tris': current_tris,
+        'modes': modes,
+        'meshes': rows,
+    }
+
+
+def measure_decimation_time(context, mesh, ratio):
+    mod = mesh.modifiers.new("CATS Decimate Analysis", 'DECIMATE')
+    mod.ratio = ratio
+    mod.use_collapse_triangulate = True
+    try:
+        start = time.perf_counter()
+        context.evaluated_depsgraph_get()
+        return time.perf_counter() - start
+    finally:
+        mesh.modifiers.remove(mod)
+
+
+def get_animation_weights(mesh):
+    # Returns the vertex indices and weights of the "CATS Animation" group.
+    # A vertex gets the highest of its normalized bone pair weights and its normalized shape key movements.
+    vertex_count = len(mesh.data.vertices)
+    new_weights = np.full(vertex_count, -np.inf)
+
+    # Weight by multiplied bone weights for every pair of bones.
+    # The memberships are sorted by vertex, so all pairs of a vertex are found by comparing each membership
+    # with the following ones of the same vertex. Both orders of a pair always get the same weights,
+    # so every pair is only stored once.
+    vertex_column, group_column, weight_column = Common.get_vertex_group_weights(mesh)
+    pair_vertices = []
+    pair_keys = []
+    pair_weights = []
+    group_count = len(mesh.vertex_groups)
+    for offset in range(1, len(vertex_column)):
+        same_vertex = vertex_column[:-offset] == vertex_column[offset:]
+        if not same_vertex.any():
+            break
+        first = np.nonzero(same_vertex)[0]
+        second = first + offset
+        groups_min = np.minimum(group_column[first], group_column[second])
+        groups_max = np.maximum(group_column[first], group_column[second])
+        pair_vertices.append(vertex_column[first])
+        pair_keys.append(groups_min * group_count + groups_max)
+        pair_weights.append(weight_column[first] * weight_column[second])
+
+    if pair_vertices:
+        pair_vertices = np.concatenate(pair_vertices)
+        pair_keys = np.concatenate(pair_keys)
+        pair_weights = np.concatenate(pair_weights)
+
+        # Normalize per vertex group pair
+        _, pair_index = np.unique(pair_keys, return_inverse=True)
+        pair_min = np.full(pair_index.max() + 1, 1.0)
+        pair_max = np.zeros(pair_index.max() + 1)
+        np.minimum.at(pair_min, pair_index, pair_weights)
+        np.maximum.at(pair_max, pair_index, pair_weights)
+        np.maximum.at(new_weights, pair_vertices, normalize_weights(pair_weights, pair_min[pair_index], pair_max[pair_index]))
+
+    # Weight by relative shape key movement, normalized by the min/max movement of each shape key
+    if mesh.data.shape_keys is not None:
+        key_blocks = mesh.data.shape_keys.key_blocks
+        basis_co = np.empty(vertex_count * 3, dtype=np.float32)
+        key_blocks[0].data.foreach_get('co', basis_co)
+        basis_co = basis_co.astype(np.float64).reshape(-1, 3)
+
+        key_co = np.empty(vertex_count * 3, dtype=np.float32)
+        for key_block in key_blocks[1:]:
+            key_block.data.foreach_get('co', key_co)
+            movement = np.sqrt(np.sum(np.square(basis_co - key_co.astype(np.float64).reshape(-1, 3)), axis=1))
+            if not len(movement):
+                continue
+            np.maximum(new_weights, normalize_weights(movement, movement.min(), max(0.0, movement.max())), out=new_weights)
+
+    indices = np.nonzero(new_weights != -np.inf)[0]
+    return indices, new_weights[indices]
+
+
+def remove_decimation_weights(mesh):
+    # Removes the temporary "CATS Animation" group, a leftover one would get the new group renamed to "CATS Animation.001"
+    vertex_group = mesh.vertex_groups.get("CATS Animation")
+    if vertex_group:
+        mesh.vertex_groups.remove(vertex_group)
+
+
+def get_finger_mask(mesh):
+    # Returns a bool array which is True for every vertex assigned to one of the finger vertex groups
+    finger_names = {finger + side for finger in Bones.bone_finger_list for side in ('L', 'R')}
+    finger_groups = [vertex_group.index for vertex_group in mesh.vertex_groups if vertex_group.name in finger_names]
+
+    mask = np.zeros(len(mesh.data.vertices), dtype=bool)
+    if finger_groups:
+        vertex_column, group_column, _ = Common.get_vertex_group_weights(mesh)
+        mask[vertex_column[np.isin(group_column, finger_groups)]] = True
+    return mask
+
+
+def normalize_weights(weights, m_min, m_max):
+    # (weight - min) / (max - min), weights with max == min are kept as they are
+    weight_range = np.asarray(m_max - m_min, dtype=np.float64)
+    safe_range = np.where(weight_range == 0, 1.0, weight_range)
+    return np.where(weight_range == 0, weights, (weights - m_min) / safe_range)
+
+
+def get_decimation_action(decimation_mode, mesh_name, shape_key_names):
+    # Returns what decimate() does with a mesh:
+    # 'IGNORE' keeps it untouched, 'REMOVE_SHAPES' removes its shape keys and decimates it,
+    # 'KEEP_SHAPES' decimates it and repairs its shape keys afterwards and 'DECIMATE' decimates a mesh without shape keys
+    if decimation_mode == 'CUSTOM' and mesh_name in ignore_meshes:
+        return 'IGNORE'
+
+    if not shape_key_names:
+        return 'DECIMATE'
+
+    if decimation_mode == 'FULL':
+        return 'REMOVE_SHAPES'
+    if decimation_mode == 'SMART':
+        if len(shape_key_names) == 1:
+            return 'REMOVE_SHAPES'
+        return 'KEEP_SHAPES'
+    if decimation_mode == 'CUSTOM':
+        for shape in ignore_shapes:
+            if shape in shape_key_names:
+                return 'IGNORE'
+        return 'REMOVE_SHAPES'
+    if decimation_mode == 'HALF' and len(shape_key_names) < 4:
+        return 'REMOVE_SHAPES'
+    if len(shape_key_names) == 1:
+        return 'REMOVE_SHAPES'
+    return 'IGNORE'
+
+
+def repair_shape_keys(mesh, basis_name="CATS Basis"):
+    # Un-applies the decimation from the shape keys, this gives the same result as calling
+    # bpy.ops.mesh.blend_from_shape(shape=basis_name, blend=-1.0, add=True) in edit mode on every shape key
+    # between the basis and the CATS Basis, but without two mode switches per shape key.
+    # Has to be called in object mode
+    key_blocks = mesh.data.shape_keys.key_blocks
+    cats_basis = key_blocks[basis_name]
+    vertex_count = len(mesh.data.vertices)
+
+    def read(key_block):
+        co = np.empty(vertex_count * 3, dtype=np.float32)
+        key_block.data.foreach_get('co', co)
+        return co
+
+    # blend_from_shape only moves selected and visible vertices
+    selected = np.empty(vertex_count, dtype=bool)
+    hidden = np.empty(vertex_count, dtype=bool)
+    mesh.data.vertices.foreach_get('select', selected)
+    mesh.data.vertices.foreach_get('hide', hidden)
+    delta = (read(cats_basis) - read(cats_basis.relative_key)).reshape(-1, 3)
+    delta[hidden | ~selected] = 0
+    delta = delta.ravel()
+
+    repaired = [key_block for index, key_block in enumerate(key_blocks) if index > 0 and key_block != cats_basis]
+    repaired_names = {key_block.name for key_block in repaired}
+    for key_block in repaired:
+        # Leaving edit mode moves the keys which are relative to the edited key along with it.
+        # So a key relative to another repaired key gets the delta added back once and ends up unchanged
+        relative_key = key_block.relative_key
+        if relative_key != key_block and relative_key.name in repaired_names:
+            continue
+
+        co = read(key_block)
+        co -= delta
+        key_block.data.foreach_set('co', co)
+
+    mesh.data.update()
+
+
+def plan_decimation(context, meshes, budget, use_weights=False, weights_factor=0.0, symmetry=False):
+    # Returns {mesh name: (ratio, planned tris)} for the given (mesh, tris) pairs.
+    # Every mesh gets a temporary Decimate modifier whose evaluated result is measured without applying anything
+    probes = {}
+    for mesh, tris in meshes:
+        mod = mesh.modifiers.new("CATS Decimate Plan", 'DECIMATE')
+        mod.use_collapse_triangulate = True
+        if use_weights:
+            mod.vertex_group = "CATS Animation"
+            mod.vertex_group_factor = weights_factor
+            mod.invert_vertex_group = True
+        if symmetry:
+            mod.use_symmetry = True
+            mod.symmetry_axis = 'X'
+        probes[mesh.name] = (mesh, mod)
+
+    def measure(ratios):
+        for name, ratio in ratios.items():
+            probes[name][1].ratio = ratio
+        depsgraph = context.evaluated_depsgraph_get()
+        return {name: Common.get_tricount(probes[name][0].evaluated_get(depsgraph)) for name in ratios}
+
+    try:
+        plan = solve_decimation_ratios({mesh.name: tris for mesh, tris in meshes}, budget, measure,
+                                       tolerance=plan_tolerance * budget, iterations=plan_iterations)
+    finally:
+        for mesh, mod in probes.values():
+            mesh.modifiers.remove(mod)
+
+    return plan
+
+
+def solve_decimation_ratios(tris_counts, budget, measure, tolerance=0, iterations=10):
+    # tris_counts is {name: tris}, measure takes {name: ratio} and returns {name: tris after decimation}.
+    # All meshes start with the same ratio. After every measurement the ratios get scaled by how far the total
+    # is off, which moves every mesh towards its share of the budget. Meshes that stopped collapsing are left
+    # where they are and the remaining meshes make up for them.
+    total = sum(tris_counts.values())
+    if not total:
+        return {name: (1, tris) for name, tris in tris_counts.items()}
+
+    ratio = min(max(budget / total, 0), 1)
+    ratios = {name: ratio for name in tris_counts}
+    results = measure(ratios)
+    stuck = set()
+    best = None
+
+    for _ in range(iterations + 1):
+        # Keep the closest plan that doesn't go over the budget, if there is one
+        result_total = sum(results.values())
+        rating = (result_total <= budget + tolerance, -abs(result_total - budget))
+        if not best or rating > best[0]:
+            best = (rating, dict(ratios), dict(results))
+
+        if abs(result_total - budget) <= tolerance:
+            break
+
+        stuck_total = sum(results[name] for name in stuck)
+        active_total = result_total - stuck_total
+        if active_total <= 0:
+            break
+
+        scale = max(budget - stuck_total, 0) / active_total
+        changed = {}
+        for name, result in results.items():
+            if name in stuck or not result:
+                continue
+            new_ratio = min(max(ratios[name] * scale, 0), 1)
+            if new_ratio != ratios[name]:
+                changed[name] = new_ratio
+        if not changed:
+            break
+
+        new_results = measure(changed)
+        for name, new_ratio in changed.items():
+            if new_results[name] == results[name]:
+                stuck.add(name)
+            ratios[name] = new_ratio
+            results[name] = new_results[name]
+
+    _, ratios, results = best
+    return {name: (ratios[name], results[name]) for name in tris_counts}
 
 
 @register_wrap
@@ -279,6 +279,9 @@ def fix_bone_orientations(armature):
 
 
 def fix_armatures_post_import(pre_import_objects):
+    # Imports can create broken meshes, so let the next mesh lookup check for them
+    Common.request_meshes_check()
+
     arm_added_during_import = [obj for obj in bpy.data.objects if obj.type == 'ARMATURE' and obj not in pre_import_objects]
     for armature in arm_added_during_import:
         print('Added: ', armature.name)
@@ -26,8 +26,8 @@
 import re
 import os
 import bpy
-import copy
 import json
+import functools
 import pathlib
 import platform
 import traceback
@@ -38,21 +38,34 @@ from datetime import datetime, timezone
 from collections import OrderedDict
 
 from . import common as Common
+from . import translate_cache as TranslateCache
+from . import translate_client as TranslateClient
 from .register import register_wrap
 from .. import globs
 # from ..googletrans import Translator  # TODO Remove this
-from ..extern_tools.google_trans_new.google_trans_new import google_translator
 from .translations import t
 
 from mmd_tools_local import translations as mmd_translations
 
 dictionary = {}
 dictionary_google = {}
+dictionary_matcher = None
+
+# Can be replaced to translate with something other than Google, e.g. a local test server
+translation_backend = None
+
+# Increased whenever the dictionaries change, this invalidates the results of all translation sessions
+dictionary_version = 0
+translation_session = None
 
 main_dir = pathlib.Path(os.path.dirname(__file__)).parent.resolve()
 resources_dir = os.path.join(str(main_dir), "resources")
 dictionary_file = os.path.join(resources_dir, "dictionary.json")
 dictionary_google_file = os.path.join(resources_dir, "dictionary_google.json")
+dictionary_google_journal_file = os.path.join(resources_dir, "dictionary_google.journal")
+dictionary_cache_file = os.path.join(resources_dir, "dictionary_cache.pickle")
+
+google_journal = TranslateCache.TranslationJournal(dictionary_google_file, dictionary_google_journal_file)
 
 
 @register_wrap
@@ -65,16 +78,10 @@ class TranslateShapekeyButton(bpy.types.Operator):
     def execute(self, context):
 
         saved_data = Common.SavedData()
+        session = get_translation_session()
 
-        to_translate = []
-
-        for mesh in Common.get_meshes_objects(mode=2):
-            if Common.has_shapekeys(mesh):
-                for shapekey in mesh.data.shape_keys.key_blocks:
-                    if 'vrc.' not in shapekey.name and shapekey.name not in to_translate:
-                        to_translate.append(shapekey.name)
-
-        update_dictionary(to_translate, translating_shapes=True, self=self)
+        if not session.dictionary_updated:
+            update_dictionary(get_shapekey_names(), translating_shapes=True, self=self)
 
         Common.update_shapekey_orders()
 
@@ -83,7 +90,7 @@ class TranslateShapekeyButton(bpy.types.Operator):
             if Common.has_shapekeys(mesh):
                 for shapekey in mesh.data.shape_keys.key_blocks:
                     if 'vrc.' not in shapekey.name:
-                        shapekey.name, translated = translate(shapekey.name, add_space=True, translating_shapes=True)
+                        shapekey.name, translated = session.translate(shapekey.name, add_space=True, translating_shapes=True)
                         if translated:
                             i += 1
 
@@ -109,17 +116,15 @@ class TranslateBonesButton(bpy.types.Operator):
         return True
 
     def execute(self, context):
-        to_translate = []
-        for armature in Common.get_armature_objects():
-            for bone in armature.data.bones:
-                to_translate.append(bone.name)
+        session = get_translation_session()
 
-        update_dictionary(to_translate, self=self)
+        if not session.dictionary_updated:
+            update_dictionary(get_bone_names(), self=self)
 
         count = 0
         for armature in Common.get_armature_objects():
             for bone in armature.data.bones:
-                bone.name, translated = translate(bone.name)
+                bone.name, translated = session.translate(bone.name)
                 if translated:
                     count += 1
 
@@ -135,32 +140,25 @@ class TranslateObjectsButton(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO', 'INTERNAL'}
 
     def execute(self, context):
-        to_translate = []
-        for obj in Common.get_objects():
-            if obj.name not in to_translate:
-                to_translate.append(obj.name)
-            if obj.type == 'ARMATURE':
-                if obj.data and obj.data.name not in to_translate:
-                    to_translate.append(obj.data.name)
-                if obj.animation_data and obj.animation_data.action:
-                    to_translate.append(obj.animation_data.action.name)
+        session = get_translation_session()
 
-        update_dictionary(to_translate, self=self)
+        if not session.dictionary_updated:
+            update_dictionary(get_object_names(), self=self)
 
         i = 0
         for obj in Common.get_objects():
-            obj.name, translated = translate(obj.name)
+            obj.name, translated = session.translate(obj.name)
             if translated:
                 i += 1
 
             if obj.type == 'ARMATURE':
                 if obj.data:
-                    obj.data.name, translated = translate(obj.data.name)
+                    obj.data.name, translated = session.translate(obj.data.name)
                     if translated:
                         i += 1
 
                 if obj.animation_data and obj.animation_data.action:
-                    obj.animation_data.action.name, translated = translate(obj.animation_data.action.name)
+                    obj.animation_data.action.name, translated = session.translate(obj.animation_data.action.name)
                     if translated:
                         i += 1
 
@@ -177,14 +175,10 @@ class TranslateMaterialsButton(bpy.types.Operator):
 
     def execute(self, context):
         saved_data = Common.SavedData()
+        session = get_translation_session()
 
-        to_translate = []
-        for mesh in Common.get_meshes_objects(mode=2):
-            for matslot in mesh.material_slots:
-                if matslot.name not in to_translate:
-                    to_translate.append(matslot.name)
-
-        update_dictionary(to_translate, self=self)
+        if not session.dictionary_updated:
+            update_dictionary(get_material_names(), self=self)
 
         i = 0
         for mesh in Common.get_meshes_objects(mode=2):
@@ -192,7 +186,7 @@ class TranslateMaterialsButton(bpy.types.Operator):
             for index, matslot in enumerate(mesh.material_slots):
                 mesh.active_material_index = index
                 if bpy.context.object.active_material:
-                    bpy.context.object.active_material.name, translated = translate(bpy.context.object.active_material.name)
+                    bpy.context.object.active_material.name, translated = session.translate(bpy.context.object.active_material.name)
                     if translated:
                         i += 1
 
@@ -257,15 +251,41 @@ class TranslateAllButton(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO', 'INTERNAL'}
 
     def execute(self, context):
+        global translation_session
+
+        # All operators share one session, so every name only gets translated once
+        translation_session = TranslationSession()
+        try:
+            return self.translate_all()
+        finally:
+            translation_session = None
 
+    def translate_all(self):
         error_shown = False
 
+        # Update the dictionary once for all names instead of once per operator
+        # Shape keys can only be added if they don't get translated by Google only
+        to_translate = get_object_names() + get_material_names()
+        if Common.get_armature():
+            to_translate += get_bone_names()
+
+        if translation_session.use_google_only:
+            if not update_dictionary(get_shapekey_names(), translating_shapes=True, self=self):
+                error_shown = True
+        else:
+            to_translate += get_shapekey_names()
+
+        if not update_dictionary(list(dict.fromkeys(to_translate)), self=self):
+            error_shown = True
+        translation_session.dictionary_updated = True
+
         try:
             if Common.get_armature():
                 bpy.ops.cats_translate.bones('INVOKE_DEFAULT')
         except RuntimeError as e:
-            self.report({'ERROR'}, str(e).replace('Error: ', ''))
-            error_shown = True
+            if not error_shown:
+                self.report({'ERROR'}, str(e).replace('Error: ', ''))
+                error_shown = True
 
         try:
             bpy.ops.cats_translate.shapekeys('INVOKE_DEFAULT')
@@ -294,9 +314,214 @@ class TranslateAllButton(bpy.types.Operator):
         return {'FINISHED'}
 
 
-# Loads the dictionaries at the start of blender
+# Collects the names for update_dictionary()
+
+def get_shapekey_names():
+    to_translate = []
+    for mesh in Common.get_meshes_objects(mode=2):
+        if Common.has_shapekeys(mesh):
+            for shapekey in mesh.data.shape_keys.key_blocks:
+                if 'vrc.' not in shapekey.name and shapekey.name not in to_translate:
+                    to_translate.append(shapekey.name)
+    return to_translate
+
+
+def get_bone_names():
+    to_translate = []
+    for armature in Common.get_armature_objects():
+        for bone in armature.data.bones:
+            to_translate.append(bone.name)
+    return to_translate
+
+
+def get_object_names():
+    to_translate = []
+    for obj in Common.get_objects():
+        if obj.name not in to_translate:
+            to_translate.append(obj.name)
+        if obj.type == 'ARMATURE':
+            if obj.data and obj.data.name not in to_translate:
+                to_translate.append(obj.data.name)
+            if obj.animation_data and obj.animation_data.action:
+                to_translate.append(obj.animation_data.action.name)
+    return to_translate
+
+
+def get_material_names():
+    to_translate = []
+    for mesh in Common.get_meshes_objects(mode=2):
+        for matslot in mesh.material_slots:
+            if matslot.name not in to_translate:
+                to_translate.append(matslot.name)
+    return to_translate
+
+
+class TranslationSession:
+    # Remembers the results of translate() during one operator run.
+    # The results are dropped as soon as update_dictionary() adds new translations.
+
+    def __init__(self, max_size=8192):
+        self.max_size = max_size
+        self.results = OrderedDict()
+        self.dictionary_version = dictionary_version
+        self.dictionary_updated = False
+        self.use_google_only = bpy.context.scene.use_google_only
+
+    def translate(self, to_translate, add_space=False, translating_shapes=False):
+        if self.dictionary_version != dictionary_version:
+            self.results.clear()
+            self.dictionary_version = dictionary_version
+
+        key = (to_translate, add_space, translating_shapes)
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+            return result
+
+        result = translate(to_translate, add_space=add_space, translating_shapes=translating_shapes, use_google_only=self.use_google_only)
+        self.results[key] = result
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+        return result
+
+
+# Returns the session of the current Translate All run, or a new one for a single operator
+def get_translation_session():
+    if translation_session:
+        return translation_session
+    return TranslationSession()
+
+
+class DictionaryMatcher:
+    # Aho-Corasick automaton over all dictionary keys.
+    # Finds every key contained in a name in a single pass over the name instead of testing each key with 'in'.
+    # Keys are ranked like the length sorted dictionary: longest first, then in the order they were added.
+
+    def __init__(self, keys=()):
+        self.goto = [{}]
+        self.fail = [0]
+        self.keys = [None]
+        self.out = [()]
+        self.ranks = {}
+        self.dirty = False
+        for key in keys:
+            self.add(key)
+        self.build()
+
+    def __contains__(self, key):
+        return key in self.ranks
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def add(self, key):
+        if not key or key in self.ranks:
+            return
+        self.ranks[key] = (-len(key), len(self.ranks))
+
+        state = 0
+        for char in key:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.keys.append(None)
+                self.out.append(())
+            state = next_state
+        self.keys[state] = key
+
+        # Failure links are rebuilt lazily on the next search, so adding many keys only costs one rebuild
+        self.dirty = True
+
+    def build(self):
+        queue = collections.deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            self.out[state] = (self.keys[state],) if self.keys[state] else ()
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self.fail[state]
+                while fail_state and char not in self.goto[fail_state]:
+                    fail_state = self.fail[fail_state]
+                fail_state = self.goto[fail_state].get(char, 0)
+
+                self.fail[next_state] = fail_state
+                own_key = self.keys[next_state]
+                self.out[next_state] = ((own_key,) if own_key else ()) + self.out[fail_state]
+
+        self.dirty = False
+
+    def find(self, text):
+        if self.dirty:
+            self.build()
+
+        found = set()
+        goto = self.goto
+        fail = self.fail
+        out = self.out
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def replace(self, to_translate, translations, length, addition=''):
+        # Replaces the dictionary keys inside the name exactly like iterating over the length sorted dictionary would:
+        # the next key that gets replaced is always the highest ranked key after the previous one that is still in the name
+        ranks = self.ranks
+        translated_count = 0
+        last_rank = None
+
+        while True:
+            next_key = None
+            next_rank = None
+            for key in self.find(to_translate):
+                if not translations.get(key):
+                    continue
+                rank = ranks[key]
+                if last_rank is not None and rank <= last_rank:
+                    continue
+                if next_rank is None or rank < next_rank:
+                    next_key = key
+                    next_rank = rank
+
+            if next_key is None:
+                break
+
+            to_translate = to_translate.replace(next_key, addition + translations[next_key])
+
+            # Check if string is fully translated
+            translated_count += len(next_key)
+            if translated_count >= length:
+                break
+
+            last_rank = next_rank
+
+        return to_translate, translated_count
+
+
+# Loads the dictionaries the first time something gets translated
 def load_translations():
-    global dictionary
+    global dictionary, dictionary_google, dictionary_matcher, dictionary_version
+    dictionary_version += 1
+
+    # Use the parsed dictionaries from the last session if none of the files changed
+    snapshot = TranslateCache.read_snapshot(dictionary_cache_file, get_dictionary_files_key())
+    if snapshot:
+        dictionary, dictionary_google, dictionary_matcher, dict_found, google_journal.journal_length = snapshot
+        globs.dict_found = dict_found
+        return dict_found
+
     dictionary = OrderedDict()
     temp_dict = OrderedDict()
     dict_found = False
@@ -316,26 +541,24 @@ def load_translations():
 
     # Load local google dictionary and add it to the temp dict
     try:
-        with open(dictionary_google_file, encoding="utf8") as file:
-            global dictionary_google
-            dictionary_google = json.load(file, object_pairs_hook=collections.OrderedDict)
-
-            if 'created' not in dictionary_google \
-                    or 'translations' not in dictionary_google \
-                    or 'translations_full' not in dictionary_google:
-                reset_google_dict()
-            else:
-                for name, trans in dictionary_google.get('translations').items():
-                    if not name:
-                        continue
-
-                    if name in temp_dict.keys():
-                        print(name, 'ALREADY IN INTERNAL DICT!')
-                        continue
-
-                    temp_dict[name] = trans
-
-            # print('GOOGLE DICTIONARY LOADED!')
+        dictionary_google = google_journal.load()
+
+        if 'created' not in dictionary_google \
+                or 'translations' not in dictionary_google \
+                or 'translations_full' not in dictionary_google:
+            reset_google_dict()
+        else:
+            for name, trans in dictionary_google.get('translations').items():
+                if not name:
+                    continue
+
+                if name in temp_dict.keys():
+                    print(name, 'ALREADY IN INTERNAL DICT!')
+                    continue
+
+                temp_dict[name] = trans
+
+        # print('GOOGLE DICTIONARY LOADED!')
     except FileNotFoundError:
         print('GOOGLE DICTIONARY NOT FOUND!')
         reset_google_dict()
@@ -349,14 +572,33 @@ def load_translations():
     for key in sorted(temp_dict, key=lambda k: len(k), reverse=True):
         dictionary[key] = temp_dict[key]
 
+    # Compile all keys into the matcher used by update_dictionary() and translate()
+    dictionary_matcher = DictionaryMatcher(dictionary.keys())
+
     # for key, value in dictionary.items():
     #     print('"' + key + '" - "' + value + '"')
 
+    # Loading the google dict can reset or compact its files, so the key has to be read afterwards
+    snapshot = (dictionary, dictionary_google, dictionary_matcher, dict_found, google_journal.journal_length)
+    TranslateCache.write_snapshot(dictionary_cache_file, get_dictionary_files_key(), snapshot)
+
+    globs.dict_found = dict_found
     return dict_found
 
 
+def get_dictionary_files_key():
+    return TranslateCache.get_files_key(dictionary_file, dictionary_google_file, dictionary_google_journal_file)
+
+
+def ensure_translations_loaded():
+    if dictionary_matcher is None:
+        load_translations()
+
+
+# Returns False if the Google translation failed
 def update_dictionary(to_translate_list, translating_shapes=False, self=None):
-    global dictionary, dictionary_google
+    global dictionary, dictionary_google, dictionary_matcher, dictionary_version
+    ensure_translations_loaded()
     regex = u'[\u3000-\u303f\u3040-\u309f\u30a0-\u30ff\uff00-\uff9f\u4e00-\u9faf\u3400-\u4dbf]+'  # Regex to look for japanese chars
 
     use_google_only = False
@@ -368,6 +610,7 @@ def update_dictionary(to_translate_list, translating_shapes=False, self=None):
         to_translate_list = [to_translate_list]
 
     google_input = []
+    google_input_set = set()
 
     # Translate everything
     for to_translate in to_translate_list:
@@ -382,97 +625,76 @@ def update_dictionary(to_translate_list, translating_shapes=False, self=None):
             if not re.findall(regex, to_translate):
                 continue
 
-            translated = False
-            for key, value in dictionary_google.get('translations_full').items():
-                if to_translate == key and value:
-                    translated = True
-
-            if not translated:
+            if not dictionary_google.get('translations_full').get(to_translate) and to_translate not in google_input_set:
                 google_input.append(to_translate)
+                google_input_set.add(to_translate)
 
         # Translate with internal dictionary
         else:
-            for key, value in dictionary.items():
-                if key in to_translate:
-                    if value:
-                        to_translate = to_translate.replace(key, value)
-                    else:
-                        continue
-
-                    # Check if string is fully translated
-                    translated_count += len(key)
-                    if translated_count >= length:
-                        break
+            to_translate, translated_count = dictionary_matcher.replace(to_translate, dictionary, length)
 
             # If not fully translated, translate the rest with Google
             if translated_count < length:
                 match = re.findall(regex, to_translate)
                 if match:
                     for name in match:
-                        if name not in google_input and name not in dictionary.keys():
+                        if name not in google_input_set and name not in dictionary:
                             google_input.append(name)
+                            google_input_set.add(name)
 
     if not google_input:
         # print('NO GOOGLE TRANSLATIONS')
-        return
+        return True
 
     # Translate the rest with google translate
     print('GOOGLE DICT UPDATE!')
-    translator = google_translator(url_suffix='com')
-    token_tries = 0
-    while True:
-        try:
-            translations = [translator.translate(text, lang_src='ja', lang_tgt='en').strip() for text in google_input]
-            break
-        except (requests.exceptions.ConnectionError, ConnectionRefusedError):
-            print('CONNECTION TO GOOGLE FAILED!')
-            if self:
-                self.report({'ERROR'}, t('update_dictionary.error.cantConnect'))
-            return
-        except json.JSONDecodeError:
-            if self:
+    translator = TranslateClient.BatchTranslator(backend=translation_backend)
+    try:
+        translations = translator.translate(google_input, lang_src='ja', lang_tgt='en')
+        print('GOOGLE REQUESTS:', translator.request_count, 'FOR', len(google_input), 'NAMES')
+    except (requests.exceptions.ConnectionError, ConnectionRefusedError):
+        print('CONNECTION TO GOOGLE FAILED!')
+        if self:
+            self.report({'ERROR'}, t('update_dictionary.error.cantConnect'))
+        return False
+    except json.JSONDecodeError:
+        if self:
+            self.report({'ERROR'}, t('update_dictionary.error.temporaryBan') + t('update_dictionary.error.catsTranslated'))
+        print('YOU GOT BANNED BY GOOGLE!')
+        return False
+    except RuntimeError as e:
+        error = Common.html_to_text(str(e))
+        if self:
+            if 'Please try your request again later' in error:
                 self.report({'ERROR'}, t('update_dictionary.error.temporaryBan') + t('update_dictionary.error.catsTranslated'))
-            print('YOU GOT BANNED BY GOOGLE!')
-            return
-        except RuntimeError as e:
-            error = Common.html_to_text(str(e))
-            if self:
-                if 'Please try your request again later' in error:
-                    self.report({'ERROR'}, t('update_dictionary.error.temporaryBan') + t('update_dictionary.error.catsTranslated'))
-                    print('YOU GOT BANNED BY GOOGLE!')
-                    return
-
-                if 'Error 403' in error:
-                    self.report({'ERROR'}, t('update_dictionary.error.cantAccess') + t('update_dictionary.error.catsTranslated'))
-                    print('NO PERMISSION TO USE GOOGLE TRANSLATE!')
-                    return
-
-                self.report({'ERROR'}, t('update_dictionary.error.errorMsg') + t('update_dictionary.error.catsTranslated') + '\n' + '\nGoogle: ' + error)
-            print('', 'You got an error message from Google:', error, '')
-            return
-        except AttributeError:
-            # If the translator wasn't able to create a stable connection to Google, just retry it again
-            # This is an issue with Google since Nov 2020: https://github.com/ssut/py-googletrans/issues/234
-            token_tries += 1
-            if token_tries < 3:
-                print('RETRY', token_tries)
-                translator = google_translator(url_suffix='com')
-                continue
-
-            # If if didn't work after 20 tries, just quit
-            # The response from Google was printed into "cats/resources/google-response.txt"
-            if self:
-                self.report({'ERROR'}, t('update_dictionary.error.apiChanged'))
-            print('ERROR: GOOGLE API CHANGED!')
-            print(traceback.format_exc())
-            return
+                print('YOU GOT BANNED BY GOOGLE!')
+                return False
+
+            if 'Error 403' in error:
+                self.report({'ERROR'}, t('update_dictionary.error.cantAccess') + t('update_dictionary.error.catsTranslated'))
+                print('NO PERMISSION TO USE GOOGLE TRANSLATE!')
+                return False
+
+            self.report({'ERROR'}, t('update_dictionary.error.errorMsg') + t('update_dictionary.error.catsTranslated') + '\n' + '\nGoogle: ' + error)
+        print('', 'You got an error message from Google:', error, '')
+        return False
+    except TranslateClient.TranslationError:
+        # The translator already retried the failed chunk, so just quit
+        # The response from Google was printed into "cats/resources/google-response.txt"
+        if self:
+            self.report({'ERROR'}, t('update_dictionary.error.apiChanged'))
+        print('ERROR: GOOGLE API CHANGED!')
+        print(traceback.format_exc())
+        return False
 
     # Update the dictionaries
+    new_entries = []
     for i, translation in enumerate(translations):
         name = google_input[i]
 
         if use_google_only:
             dictionary_google['translations_full'][name] = translation
+            new_entries.append(('translations_full', name, translation))
         else:
             # Capitalize words
             translation_words = translation.split(' ')
@@ -481,33 +703,33 @@ def update_dictionary(to_translate_list, translating_shapes=False, self=None):
 
             dictionary[name] = translation
             dictionary_google['translations'][name] = translation
+            dictionary_matcher.add(name)
+            new_entries.append(('translations', name, translation))
 
         print(google_input[i], '->', translation)
 
-    # Sort dictionary
-    temp_dict = copy.deepcopy(dictionary)
-    dictionary = OrderedDict()
-    for key in sorted(temp_dict, key=lambda k: len(k), reverse=True):
-        dictionary[key] = temp_dict[key]
-
-    # Save the google dict locally
-    save_google_dict()
+    # The dictionary doesn't need to be sorted again, the matcher ranks new keys by their length
+    # Only the new translations get appended to the local google dict
+    google_journal.append(new_entries)
+    dictionary_version += 1
+    if google_journal.needs_compaction():
+        save_google_dict()
 
     print('DICTIONARY UPDATE SUCCEEDED!')
-    return
+    return True
 
 
-def translate(to_translate, add_space=False, translating_shapes=False):
+def translate(to_translate, add_space=False, translating_shapes=False, use_google_only=None):
     global dictionary
+    ensure_translations_loaded()
 
     pre_translation = to_translate
     length = len(to_translate)
-    translated_count = 0
 
-    # Figure out whether to use google only or not
-    use_google_only = False
-    if translating_shapes and bpy.context.scene.use_google_only:
-        use_google_only = True
+    # Figure out whether to use google only or not. Translation sessions pass in the setting they read once
+    if use_google_only is None:
+        use_google_only = bpy.context.scene.use_google_only
+    use_google_only = bool(translating_shapes and use_google_only)
 
     # Add space for shape keys
     addition = ''
@@ -519,24 +741,14 @@ def translate(to_translate, add_space=False, translating_shapes=False):
 
     # Translate shape keys with Google Translator only, if the user chose this
     if use_google_only:
-        for key, value in dictionary_google.get('translations_full').items():
-            if to_translate == key and value:
-                to_translate = value
+        value = dictionary_google.get('translations_full').get(to_translate)
+        if value:
+            to_translate = value
 
     # Translate with internal dictionary
+    # Keys with empty translations are skipped by the matcher. They are removed at the end
     else:
-        for key, value in dictionary.items():
-            if key in to_translate:
-                # If string is empty, don't replace it. This will be done at the end
-                if not value:
-                    continue
-
-                to_translate = to_translate.replace(key, addition + value)
-
-                # Check if string is fully translated
-                translated_count += len(key)
-                if translated_count >= length:
-                    break
+        to_translate, _ = dictionary_matcher.replace(to_translate, dictionary, length, addition=addition)
 
     to_translate = to_translate.replace('.L', '_L').replace('.R', '_R').replace('  ', ' ').replace('し', '').replace('っ', '').strip()
 
@@ -546,11 +758,23 @@ def translate(to_translate, add_space=False, translating_shapes=False):
     return to_translate, pre_translation != to_translate
 
 
+# Half width chars with voiced marks are replaced by a regex first, all remaining single chars with one translate table
+jp_half_to_full_sequences = {half: full for half, full in mmd_translations.jp_half_to_full_tuples if len(half) > 1}
+jp_half_to_full_regex = re.compile('|'.join(re.escape(half) for half in sorted(jp_half_to_full_sequences, key=len, reverse=True)))
+jp_half_to_full_table = str.maketrans({half: full for half, full in mmd_translations.jp_half_to_full_tuples if len(half) == 1})
+
+
 def fix_jp_chars(name):
-    for values in mmd_translations.jp_half_to_full_tuples:
-        if values[0] in name:
-            name = name.replace(values[0], values[1])
-    return name
+    # Pure ASCII names can't contain half width chars
+    if name.isascii():
+        return name
+    return fix_jp_chars_cached(name)
+
+
+@functools.lru_cache(maxsize=4096)
+def fix_jp_chars_cached(name):
+    name = jp_half_to_full_regex.sub(lambda match: jp_half_to_full_sequences[match.group(0)], name)
+    return name.translate(jp_half_to_full_table)
 
 
 def reset_google_dict():
@@ -568,8 +792,8 @@ def reset_google_dict():
 
 
 def save_google_dict():
-    with open(dictionary_google_file, 'w', encoding="utf8") as outfile:
-        json.dump(dictionary_google, outfile, ensure_ascii=False, indent=4)
+    # Writes the full google dict and clears the journal
+    google_journal.save(dictionary_google)
 
 # def cvs_to_json():
 #     temp_dict = OrderedDict()
@@ -0,0 +1,152 @@
+# MIT License
+
+# Copyright (c) 2017 GiveMeAllYourCats
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Code author: GiveMeAllYourCats
+# Repo: https://github.com/michaeldegroot/cats-blender-plugin
+# Edits by: GiveMeAllYourCats, Hotox
+
+import os
+import json
+import pickle
+
+from collections import OrderedDict
+
+# Increase this when the layout of the cached snapshots changes
+snapshot_version = 1
+
+
+class TranslationJournal:
+    # Stores the Google dictionary as a JSON snapshot plus an append-only journal of new translations.
+    # Saving new translations only appends their lines to the journal instead of rewriting the whole dictionary.
+    # The journal gets merged back into the snapshot once it grows too large.
+
+    def __init__(self, snapshot_file, journal_file, compact_after=1000):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.compact_after = compact_after
+        self.journal_length = 0
+
+    def load(self):
+        # Raises FileNotFoundError and json.JSONDecodeError for a missing or broken snapshot, just like json.load
+        with open(self.snapshot_file, encoding="utf8") as file:
+            data = json.load(file, object_pairs_hook=OrderedDict)
+
+        self.journal_length = self.replay(data)
+        if self.journal_length >= self.compact_after:
+            self.save(data)
+
+        return data
+
+    def replay(self, data):
+        count = 0
+        try:
+            with open(self.journal_file, encoding="utf8") as file:
+                for line in file:
+                    try:
+                        table, name, translation = json.loads(line)
+                    except (ValueError, TypeError):
+                        # Skip lines that were only partially written, e.g. when Blender crashed
+                        continue
+
+                    if not isinstance(data.get(table), dict):
+                        continue
+                    data[table][name] = translation
+                    count += 1
+        except FileNotFoundError:
+            pass
+        return count
+
+    def append(self, entries):
+        # Entries are (table, name, translation) tuples, the journal file is only opened when there is something to write
+        if not entries:
+            return
+
+        # Start on a new line if the last write was interrupted
+        broken_line = False
+        try:
+            with open(self.journal_file, 'rb') as file:
+                file.seek(0, os.SEEK_END)
+                if file.tell():
+                    file.seek(-1, os.SEEK_END)
+                    broken_line = file.read(1) != b'\n'
+        except FileNotFoundError:
+            pass
+
+        with open(self.journal_file, 'a', encoding="utf8") as file:
+            if broken_line:
+                file.write('\n')
+            for entry in entries:
+                file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.journal_length += len(entries)
+
+    def needs_compaction(self):
+        return self.journal_length >= self.compact_after
+
+    def save(self, data):
+        # Writes the full snapshot and empties the journal
+        temp_file = self.snapshot_file + '.tmp'
+        with open(temp_file, 'w', encoding="utf8") as outfile:
+            json.dump(data, outfile, ensure_ascii=False, indent=4)
+        os.replace(temp_file, self.snapshot_file)
+
+        if os.path.isfile(self.journal_file):
+            os.remove(self.journal_file)
+        self.journal_length = 0
+
+
+# Binary snapshots of parsed tables, reused across sessions as long as the source files didn't change
+
+def get_files_key(*files, extra=None):
+    key = [snapshot_version, extra]
+    for file in files:
+        try:
+            stat = os.stat(file)
+            key.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            key.append(None)
+    return tuple(key)
+
+
+def read_snapshot(cache_file, key):
+    try:
+        with open(cache_file, 'rb') as file:
+            cached_key, data = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError):
+        print('BROKEN CACHE:', os.path.basename(cache_file))
+        return None
+
+    if cached_key != key:
+        return None
+    return data
+
+
+def write_snapshot(cache_file, key, data):
+    temp_file = cache_file + '.tmp'
+    try:
+        with open(temp_file, 'wb') as file:
+            pickle.dump((key, data), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        # Without write permissions the tables just get parsed again next time
+        print('COULD NOT WRITE CACHE:', os.path.basename(cache_file))
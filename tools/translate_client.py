@@ -0,0 +1,210 @@
+# MIT License
+
+# Copyright (c) 2017 GiveMeAllYourCats
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Code author: GiveMeAllYourCats
+# Repo: https://github.com/michaeldegroot/cats-blender-plugin
+# Edits by: GiveMeAllYourCats, Hotox
+
+import abc
+import json
+import time
+import requests
+import threading
+
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+# Google rejects requests with more than 5000 characters, stay well below that
+max_chunk_chars = 1500
+max_chunk_names = 60
+
+
+class TranslationError(Exception):
+    # Raised when the response for a chunk still couldn't be read after all retries
+    pass
+
+
+class TranslationBackend(abc.ABC):
+    requests_per_second = 4.0
+
+    @abc.abstractmethod
+    def translate(self, text, lang_src, lang_tgt):
+        # Translates the text of one request. Line breaks have to be kept, they are used to split the batch again.
+        # Returns None if the response could not be read, this gets retried by the BatchTranslator.
+        pass
+
+
+class GoogleBackend(TranslationBackend):
+    # The request and response format of the batchexecute endpoint is the one of google_trans_new 1.1.9
+    # (google_translator._package_rpc and google_translator.translate in extern_tools/google_trans_new).
+    # It is copied here because google_translator.translate() only returns the first sentence, which breaks batches.
+    # Update both places if Google changes the format.
+    rpc_id = 'MkEWBc'
+
+    def __init__(self, url_suffix='com', url=None, timeout=5):
+        self.url_suffix = url_suffix
+        self.url = url if url else 'https://translate.google.{}/_/TranslateWebserverUi/data/batchexecute'.format(url_suffix)
+        self.timeout = timeout
+
+    def package_rpc(self, text, lang_src, lang_tgt):
+        parameter = json.dumps([[text.strip(), lang_src, lang_tgt, True], [1]], separators=(',', ':'))
+        rpc = json.dumps([[[self.rpc_id, parameter, None, 'generic']]], separators=(',', ':'))
+        return 'f.req={}&'.format(quote(rpc))
+
+    def translate(self, text, lang_src, lang_tgt):
+        headers = {
+            "Referer": "http://translate.google.{}/".format(self.url_suffix),
+            "User-Agent":
+                "Mozilla/5.0 (Windows NT 10.0; WOW64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/47.0.2526.106 Safari/537.36",
+            "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
+        }
+        data = self.package_rpc(text, lang_src, lang_tgt)
+
+        try:
+            response = requests.post(self.url, data=data, headers=headers, timeout=self.timeout)
+        except requests.exceptions.ConnectionError:
+            raise
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(str(e))
+
+        # The error pages of Google are handled by update_dictionary()
+        if response.status_code != 200:
+            raise RuntimeError(response.text)
+
+        for line in response.iter_lines(chunk_size=1024):
+            line = line.decode('utf-8')
+            if self.rpc_id in line:
+                return self.read_response(line)
+        return None
+
+    @staticmethod
+    def read_response(line):
+        # Same format as google_translator.translate() reads, but all sentences are kept instead of only the first one
+        try:
+            response = json.loads(line + ']')
+            response = json.loads(response[0][2])
+            result = response[1][0]
+            if len(result[0]) > 5:
+                return ''.join(sentence[0] for sentence in result[0][5] if sentence and sentence[0])
+            return result[0][0]
+        except (IndexError, KeyError, TypeError):
+            return None
+
+
+class TokenBucket:
+    # Allows 'rate' requests per second on average with bursts of up to 'capacity' requests
+    def __init__(self, rate=4.0, capacity=4):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class BatchTranslator:
+    # Packs many names into a few requests, one name per line, and sends them on a small thread pool.
+    # Every chunk is retried on its own, so one broken response doesn't restart the whole batch.
+    def __init__(self, backend=None, workers=3, rate_limiter=None, retries=3):
+        self.backend = backend if backend else GoogleBackend()
+        self.workers = workers
+        self.rate_limiter = rate_limiter if rate_limiter else TokenBucket(rate=self.backend.requests_per_second)
+        self.retries = retries
+        self.request_count = 0
+        self.count_lock = threading.Lock()
+
+    def translate(self, names, lang_src='ja', lang_tgt='en'):
+        names = list(names)
+        if not names:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.translate_chunk, chunk, lang_src, lang_tgt) for chunk in self.make_chunks(names)]
+            translations = []
+            for future in futures:
+                translations += future.result()
+
+        return translations
+
+    @staticmethod
+    def make_chunks(names):
+        chunk = []
+        chunk_chars = 0
+        for name in names:
+            # Names with line breaks can't be split back out of a batch, send them alone
+            if '\n' in name:
+                yield [name]
+                continue
+
+            if chunk and (len(chunk) >= max_chunk_names or chunk_chars + len(name) + 1 > max_chunk_chars):
+                yield chunk
+                chunk = []
+                chunk_chars = 0
+
+            chunk.append(name)
+            chunk_chars += len(name) + 1
+
+        if chunk:
+            yield chunk
+
+    def request(self, text, lang_src, lang_tgt):
+        tries = 0
+        while True:
+            self.rate_limiter.acquire()
+            with self.count_lock:
+                self.request_count += 1
+
+            result = self.backend.translate(text, lang_src, lang_tgt)
+            if result is not None:
+                return result
+
+            # If the translator wasn't able to read the response from Google, just retry it again
+            # This is an issue with Google since Nov 2020: https://github.com/ssut/py-googletrans/issues/234
+            tries += 1
+            if tries >= self.retries:
+                raise TranslationError('Could not read the response from Google after ' + str(tries) + ' tries')
+            print('RETRY', tries)
+
+    def translate_chunk(self, chunk, lang_src, lang_tgt):
+        if len(chunk) == 1:
+            return [self.request(chunk[0], lang_src, lang_tgt).strip()]
+
+        lines = self.request('\n'.join(chunk), lang_src, lang_tgt).strip().split('\n')
+        if len(lines) == len(chunk):
+            return [line.strip() for line in lines]
+
+        # Google merged or split some lines, so translate both halves separately
+        half = len(chunk) // 2
+        return self.translate_chunk(chunk[:half], lang_src, lang_tgt) + self.translate_chunk(chunk[half:], lang_src, lang_tgt)
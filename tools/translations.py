@@ -5,6 +5,7 @@ import csv
 import ssl
 import bpy
 import json
+import string
 import urllib
 import pathlib
 import addon_utils
@@ -12,15 +13,26 @@ from bpy.app.translations import locale
 
 from .register import register_wrap
 from . import settings
+from . import translate_cache as TranslateCache
 
 main_dir = pathlib.Path(os.path.dirname(__file__)).parent.resolve()
 resources_dir = os.path.join(str(main_dir), "resources")
 translations_file = os.path.join(resources_dir, "translations.csv")
 settings_file = os.path.join(resources_dir, "settings.json")
+translations_cache_file = os.path.join(resources_dir, "translations_cache.pickle")
 
-dictionary = {}
+dictionary = None
 languages = []
 verbose = True
+
+# Phrases without placeholders are stored already formatted, all others as their str.format method
+constant_phrases = {}
+template_phrases = {}
+missing_phrases = set()
+
+# Set the environment variable CATS_COUNT_T_CALLS to print how often t() gets called per redraw of the CATS tab
+count_calls = bool(os.environ.get('CATS_COUNT_T_CALLS'))
+call_count = 0
 translation_download_link = "https://docs.google.com/spreadsheets/d/1ZAqNxaduDJJ31t9z3BXyBSDmq4mEGySaFafydRoglf4/export?gid=346601779&format=csv"
 
 
@@ -32,6 +44,14 @@ def load_translations():
     # Check the settings which translation to load
     language = get_language_from_settings()
 
+    # Use the parsed table from the last session if neither the csv nor the language changed
+    cache_key = TranslateCache.get_files_key(translations_file, extra=language)
+    snapshot = TranslateCache.read_snapshot(translations_cache_file, cache_key)
+    if snapshot:
+        dictionary, languages = snapshot
+        compile_phrases()
+        return
+
     with open(translations_file, 'r', encoding="utf8") as csv_file:
         csv_reader = csv.DictReader(csv_file, delimiter=',')
         if not csv_reader:
@@ -51,17 +71,64 @@ def load_translations():
                         languages.append(key)
 
     check_missing_translations()
+    compile_phrases()
+    TranslateCache.write_snapshot(translations_cache_file, cache_key, (dictionary, languages))
+
+
+def compile_phrases():
+    global constant_phrases, template_phrases, missing_phrases
+    constant_phrases = {}
+    template_phrases = {}
+    missing_phrases = set()
+
+    for phrase, text in dictionary.items():
+        if text is None:
+            continue
+
+        try:
+            has_fields = any(field is not None for _, field, _, _ in string.Formatter().parse(text))
+        except ValueError:
+            # Broken braces, let str.format raise the error when the phrase is used, like before
+            has_fields = True
+
+        if has_fields:
+            template_phrases[phrase] = text.format
+        else:
+            constant_phrases[phrase] = text.format()
 
 
 def t(phrase: str, *args, **kwargs):
     # Translate the given phrase into Blender's current language.
-    output = dictionary.get(phrase)
-    if output is None:
+    # The translations are loaded on the first call
+    if count_calls:
+        global call_count
+        call_count += 1
+
+    output = constant_phrases.get(phrase)
+    if output is not None:
+        return output
+
+    template = template_phrases.get(phrase)
+    if template is not None:
+        return template(*args, **kwargs)
+
+    if dictionary is None:
+        load_translations()
+        return t(phrase, *args, **kwargs)
+
+    # Only warn once about every unknown phrase
+    if phrase not in missing_phrases:
+        missing_phrases.add(phrase)
         if verbose:
             print('Warning: Unknown phrase: ' + phrase)
-        return phrase
+    return phrase
+
 
-    return output.format(*args, **kwargs)
+def report_call_count():
+    global call_count
+    if count_calls:
+        print('t() calls during the last redraw:', call_count)
+        call_count = 0
 
 
 def check_missing_translations():
@@ -71,6 +138,9 @@ def check_missing_translations():
 
 
 def get_languages_list(self, context):
+    if dictionary is None:
+        load_translations()
+
     choices = []
 
     for language in languages:
@@ -145,6 +215,3 @@ class DownloadTranslations(bpy.types.Operator):
 
         self.report({'INFO'}, "Successfully downloaded the translations")
         return {'FINISHED'}
-
-
-load_translations()
\ No newline at end of file
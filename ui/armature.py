@@ -9,7 +9,7 @@ from ..tools import supporter as Supporter
 from ..tools import eyetracking as Eyetracking
 from ..tools import armature_manual as Armature_manual
 from ..tools.register import register_wrap
-from ..tools.translations import t
+from ..tools.translations import t, report_call_count
 
 
 @register_wrap
@@ -18,6 +18,9 @@ class ArmaturePanel(ToolPanel, bpy.types.Panel):
     bl_label = t('ArmaturePanel.label')
 
     def draw(self, context):
+        # This is the first panel of the CATS tab, so every draw starts a new redraw of the tab
+        report_call_count()
+
         layout = self.layout
         box = layout.box()
 
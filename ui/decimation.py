@@ -179,8 +179,30 @@ class DecimationPanel(ToolPanel, bpy.types.Panel):
         row.operator(Decimation.AutoDecimatePresetQuest.bl_idname)
         row = col.row(align=True)
         row.prop(context.scene, 'max_tris')
+
+        # Live tri budget of the current model
+        meshes = Common.get_meshes_objects(check=False)
+        if meshes:
+            tris_count = 0
+            box2 = col.box()
+            col2 = box2.column(align=True)
+            for mesh in meshes:
+                tris = Common.get_tricount(mesh)
+                tris_count += tris
+                row = layout_split(col2, factor=0.7, align=False)
+                row.scale_y = 0.7
+                row.label(text=mesh.name, icon='MESH_DATA')
+                row.label(text=str(tris))
+            row = col2.row(align=True)
+            row.label(text=t('DecimationPanel.currentTris', tris=tris_count, max_tris=context.scene.max_tris),
+                      icon='ERROR' if tris_count > context.scene.max_tris else 'CHECKMARK')
         col.separator()
         col.label(text=t('DecimationPanel.warn.notIfBaking'), icon='INFO')
-        row = col.row(align=True)
+        split = col.row(align=True)
+        row = split.row(align=True)
         row.scale_y = 1.2
         row.operator(Decimation.AutoDecimateButton.bl_idname, icon='MOD_DECIM')
+        row = split.row(align=True)
+        row.alignment = 'RIGHT'
+        row.scale_y = 1.2
+        row.operator(Decimation.AnalyzeDecimationButton.bl_idname, text='', icon='VIEWZOOM')